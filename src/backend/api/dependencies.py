@@ -3,6 +3,8 @@ FastAPI dependencies for authentication and shared resources.
 """
 
 import logging
+import time
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Any, TypedDict, cast
 
 from fastapi import Depends, HTTPException, Request
@@ -14,6 +16,17 @@ logger = logging.getLogger(__name__)
 
 MAX_TITLE_LENGTH = 50
 
+# Conversation items scanned (oldest first) for a first user message to title with
+TITLE_SCAN_ITEMS = 20
+
+# Recently retrieved conversations, keyed by conversation_id ->
+# (conversation, metadata, retrieved_at).  Every conversation route verifies
+# access first, so a short TTL saves a Foundry round trip per request while
+# bounding staleness of metadata edited by another replica.
+CONVERSATION_CACHE_TTL_SECONDS = 60.0
+MAX_CONVERSATION_CACHE_ENTRIES = 1000
+_conversation_cache: OrderedDict[str, tuple[Any, dict[str, Any], float]] = OrderedDict()
+
 
 class OwnershipContext(TypedDict):
     """Ownership verification result payload for conversation routes."""
@@ -29,7 +42,10 @@ def get_user_id(request: Request) -> str:
 
     Raises HTTPException 401 if not authenticated.
     """
-    user_id = getattr(request.state, "user_id", None)
+    try:
+        user_id = request.state.user_id
+    except AttributeError:
+        user_id = None
     if not user_id:
         raise HTTPException(status_code=401, detail="Authentication required")
     return user_id
@@ -37,7 +53,10 @@ def get_user_id(request: Request) -> str:
 
 def get_optional_user_id(request: Request) -> str | None:
     """Get user ID from request state, or None if not authenticated."""
-    return getattr(request.state, "user_id", None)
+    try:
+        return request.state.user_id
+    except AttributeError:
+        return None
 
 
 def get_project_client(request: Request) -> Any:  # noqa: ANN401
@@ -48,13 +67,17 @@ def get_project_client(request: Request) -> Any:  # noqa: ANN401
 
     Raises HTTPException 503 if not initialized.
     """
-    chat_client = getattr(request.app.state, "chat_client", None)
+    try:
+        chat_client = request.app.state.chat_client
+    except AttributeError:
+        chat_client = None
     if chat_client is None:
         raise HTTPException(status_code=503, detail="Chat client not initialized")
     # Access the underlying AIProjectClient from AzureAIClient
-    if hasattr(chat_client, "project_client"):
+    try:
         return chat_client.project_client
-    return chat_client
+    except AttributeError:
+        return chat_client
 
 
 def get_agent(request: Request) -> "Agent":
@@ -63,12 +86,42 @@ def get_agent(request: Request) -> "Agent":
 
     Raises HTTPException 503 if not initialized.
     """
-    agent = getattr(request.app.state, "agent", None)
+    try:
+        agent = request.app.state.agent
+    except AttributeError:
+        agent = None
     if agent is None:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     return agent
 
 
+def _get_cached_conversation(conversation_id: str) -> tuple[Any, dict[str, Any]] | None:
+    """Return a fresh cached (conversation, metadata) pair, if any."""
+    entry = _conversation_cache.get(conversation_id)
+    if entry is None:
+        return None
+    conversation, metadata, retrieved_at = entry
+    if time.monotonic() - retrieved_at >= CONVERSATION_CACHE_TTL_SECONDS:
+        del _conversation_cache[conversation_id]
+        return None
+    _conversation_cache.move_to_end(conversation_id)
+    return conversation, metadata
+
+
+def _cache_conversation(
+    conversation_id: str, conversation: object, metadata: dict[str, Any]
+) -> None:
+    _conversation_cache[conversation_id] = (conversation, metadata, time.monotonic())
+    _conversation_cache.move_to_end(conversation_id)
+    while len(_conversation_cache) > MAX_CONVERSATION_CACHE_ENTRIES:
+        _conversation_cache.popitem(last=False)
+
+
+def invalidate_conversation(conversation_id: str) -> None:
+    """Drop a cached conversation after it is updated or deleted."""
+    _conversation_cache.pop(conversation_id, None)
+
+
 async def verify_conversation_ownership(
     conversation_id: str,
     user_id: str = Depends(get_user_id),
@@ -80,6 +133,11 @@ async def verify_conversation_ownership(
     Returns the conversation if ownership is verified.
     Raises HTTPException 403 if access is denied.
     """
+    cached = _get_cached_conversation(conversation_id)
+    if cached is not None:
+        conversation, metadata = cached
+        return {"conversation": conversation, "metadata": metadata, "user_id": user_id}
+
     try:
         # Get the OpenAI client from the project client
         openai_client = project_client.get_openai_client()
@@ -106,6 +164,7 @@ async def verify_conversation_ownership(
             raise HTTPException(status_code=404, detail="Conversation not found") from e
         raise HTTPException(status_code=500, detail=str(e)) from e
     else:
+        _cache_conversation(conversation_id, conversation, metadata)
         return {
             "conversation": conversation,
             "metadata": metadata,
@@ -115,22 +174,27 @@ async def verify_conversation_ownership(
 
 def extract_message_text(msg: Any) -> str:  # noqa: ANN401
     """Extract text content from a message object."""
-    content = ""
-    if hasattr(msg, "content"):
+    try:
         msg_content = msg.content
-        if isinstance(msg_content, str):
-            return msg_content
-        if isinstance(msg_content, list):
-            for part in msg_content:
-                if hasattr(part, "text"):
-                    text_val = part.text
-                    if hasattr(text_val, "value"):
-                        content += text_val.value
-                    else:
-                        content += str(text_val)
-                elif isinstance(part, dict) and "text" in part:
-                    content += part["text"]
-    return content
+    except AttributeError:
+        return ""
+    if isinstance(msg_content, str):
+        return msg_content
+    if not isinstance(msg_content, list):
+        return ""
+    texts: list[str] = []
+    for part in msg_content:
+        try:
+            text_val = part.text
+        except AttributeError:
+            if isinstance(part, dict) and "text" in part:
+                texts.append(part["text"])
+            continue
+        try:
+            texts.append(text_val.value)
+        except AttributeError:
+            texts.append(str(text_val))
+    return "".join(texts)
 
 
 async def get_conversation_title(
@@ -149,10 +213,13 @@ async def get_conversation_title(
 
     try:
         openai_client = cast(Any, project_client).get_openai_client()
-        # List items in the conversation to find first user message
-        items = openai_client.conversations.items.list(conversation_id)
-        for item in items:
-            if hasattr(item, "role") and item.role == "user":
+        # Read one page of the oldest items; iterating the page itself would
+        # auto-paginate through the whole conversation.
+        page = openai_client.conversations.items.list(
+            conversation_id, order="asc", limit=TITLE_SCAN_ITEMS
+        )
+        for item in page.data:
+            if getattr(item, "role", None) == "user":
                 text = extract_message_text(item)
                 if text:
                     return text[:MAX_TITLE_LENGTH] + "..." if len(text) > MAX_TITLE_LENGTH else text
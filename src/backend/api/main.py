@@ -10,6 +10,8 @@ The API uses a hybrid architecture:
 - The assistant invokes the pipeline for data questions
 """
 
+import asyncio
+import contextlib
 import logging
 import os
 from collections.abc import AsyncIterator
@@ -23,6 +25,12 @@ from dotenv import load_dotenv
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from shared.clients import (
+    close_openai_clients,
+    close_shared_credential,
+    close_sql_pools,
+    warm_up_search,
+)
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.responses import Response
 
@@ -95,7 +103,8 @@ async def lifespan(_application: FastAPI) -> AsyncIterator[None]:
 
     Initializes application state on startup and cleans up on shutdown.
     The DataAssistant and NL2SQL pipeline are created per-session
-    by the chat router, not at startup.
+    by the chat router, not at startup. Search clients are warmed in a
+    background task so readiness is not delayed.
     """
     # Startup logging
     logger.info("Enterprise Data Agent API starting")
@@ -108,6 +117,9 @@ async def lifespan(_application: FastAPI) -> AsyncIterator[None]:
             "OpenTelemetry observability is disabled (set ENABLE_INSTRUMENTATION=true to enable)"
         )
 
+    # Start warming search first so it overlaps the OpenID metadata fetch below
+    warmup_task = asyncio.create_task(warm_up_search())
+
     # Log authentication status
     if AUTH_ENABLED:
         logger.info("Azure AD authentication is ENABLED")
@@ -128,6 +140,12 @@ async def lifespan(_application: FastAPI) -> AsyncIterator[None]:
 
     yield
 
+    warmup_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await warmup_task
+    await close_sql_pools()
+    await close_openai_clients()
+    await close_shared_credential()
     logger.info("Application shutdown complete")
 
 
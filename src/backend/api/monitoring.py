@@ -17,6 +17,18 @@ from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Enable azure_sdk to trace Azure AI Foundry/Inference calls
+_INSTRUMENTATION_OPTIONS = {
+    "azure_sdk": {"enabled": True},  # Trace Azure SDK calls (AI Foundry)
+    "fastapi": {"enabled": True},  # Trace FastAPI requests
+    "requests": {"enabled": True},  # Trace HTTP requests
+    "urllib3": {"enabled": True},  # Trace urllib3 requests
+}
+
+# Set once Azure Monitor is configured; configuring it twice (module reloads,
+# test harnesses) would install duplicate exporters and instrumentation.
+_configured = False
+
 
 def is_observability_enabled() -> bool:
     """Check if OpenTelemetry observability is enabled."""
@@ -27,8 +39,12 @@ def configure_observability() -> None:
     """Configure Application Insights observability if enabled.
 
     Reads all values from ``Settings`` rather than ``os.getenv()``.
-    Requires ``applicationinsights_connection_string`` to be set.
+    Requires ``applicationinsights_connection_string`` to be set.  Calls
+    after the first successful configuration are no-ops.
     """
+    if _configured:
+        return
+
     settings = get_settings()
 
     if not settings.enable_instrumentation:
@@ -56,6 +72,7 @@ def configure_observability() -> None:
 
 def _configure_azure_monitor(connection_string: str, *, enable_sensitive: bool) -> None:
     """Configure Azure Monitor for production telemetry."""
+    global _configured
     try:
         from agent_framework.observability import (  # noqa: PLC0415
             create_resource,
@@ -66,17 +83,11 @@ def _configure_azure_monitor(connection_string: str, *, enable_sensitive: bool)
         )
 
         # Configure Azure Monitor with instrumentation options
-        # Enable azure_sdk to trace Azure AI Foundry/Inference calls
         configure_azure_monitor(
             connection_string=connection_string,
             resource=create_resource(),
             enable_live_metrics=True,
-            instrumentation_options={
-                "azure_sdk": {"enabled": True},  # Trace Azure SDK calls (AI Foundry)
-                "fastapi": {"enabled": True},  # Trace FastAPI requests
-                "requests": {"enabled": True},  # Trace HTTP requests
-                "urllib3": {"enabled": True},  # Trace urllib3 requests
-            },
+            instrumentation_options=_INSTRUMENTATION_OPTIONS,
         )
 
         # Enable Agent Framework instrumentation for workflow/executor tracing
@@ -92,6 +103,7 @@ def _configure_azure_monitor(connection_string: str, *, enable_sensitive: bool)
             logging.CRITICAL
         )
 
+        _configured = True
         logger.info(
             "OpenTelemetry configured with Azure Monitor (sensitive_data=%s)", enable_sensitive
         )
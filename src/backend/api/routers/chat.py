@@ -15,6 +15,8 @@ import json
 import logging
 import uuid
 from collections.abc import AsyncGenerator
+from json.encoder import encode_basestring_ascii
+from typing import Any
 
 from api.dependencies import get_optional_user_id
 from api.step_events import (
@@ -34,6 +36,101 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
+# Posted to a request's step queue when its pipeline task finishes.
+_STEPS_DONE: dict = {}
+
+# Bound on step events buffered per request.  A request reports a few dozen
+# at most; if a stalled client lets the queue fill, producers drop further
+# progress events (they are cosmetic) instead of growing memory.
+STEP_QUEUE_MAX_EVENTS = 256
+
+
+# Compact separators trim every frame, which matters most for result rows.
+# A shared encoder avoids the per-call encoder json.dumps builds for non-default
+# options.
+_SSE_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _sse(payload: dict) -> str:
+    """Format *payload* as one SSE ``data:`` frame."""
+    return f"data: {_SSE_ENCODER.encode(payload)}\n\n"
+
+
+def _json_str(value: str | None) -> str:
+    """Encode an optional string as a JSON literal, matching ``_SSE_ENCODER``."""
+    return "null" if value is None else encode_basestring_ascii(value)
+
+
+# Fixed-shape frames sent on every request skip the generic encoder walk.
+def _text_event(text: str, conversation_id: str | None) -> str:
+    """Format a conversational reply as an SSE frame."""
+    return f'data: {{"text":{_json_str(text)},"conversation_id":{_json_str(conversation_id)}}}\n\n'
+
+
+def _done_event(conversation_id: str | None) -> str:
+    """Format the terminal ``done`` frame for a conversation."""
+    return f'data: {{"done":true,"conversation_id":{_json_str(conversation_id)}}}\n\n'
+
+
+_STEPS_COMPLETE_EVENT = _sse({"steps_complete": True, "done": False})
+
+# Orchestrator-level steps; their "started" frames never vary.
+_CLASSIFY_STEP = "Analyzing request..."
+_CONVERSATION_STEP = "Generating response..."
+_CLASSIFY_STARTED_EVENT = _sse({"step": _CLASSIFY_STEP, "status": "started"})
+_CONVERSATION_STARTED_EVENT = _sse({"step": _CONVERSATION_STEP, "status": "started"})
+
+
+def _tool_call_event(tool_call: dict, conversation_id: str | None) -> str:
+    """Format a tool result as an SSE frame for the given conversation."""
+    return _sse({"tool_call": tool_call, "done": False, "conversation_id": conversation_id})
+
+
+def _scenario_tool_call(
+    tool_call_id: str,
+    *,
+    mode: str = "scenario",
+    scenario_type: str | None = "",
+    prompt_hints: list[dict],
+    **result_fields: object,
+) -> dict:
+    """Build a ``scenario_analysis`` tool call, leaving unset result fields empty."""
+    result: dict[str, Any] = {
+        "mode": mode,
+        "scenario_type": scenario_type,
+        "assumptions": [],
+        "metrics": [],
+        "summary_totals": {},
+        "data_limitations": [],
+        "visualization": None,
+        "narrative": None,
+        "prompt_hints": prompt_hints,
+    }
+    result.update(result_fields)
+    return {
+        "tool_name": "scenario_analysis",
+        "tool_call_id": tool_call_id,
+        "args": {},
+        "result": result,
+    }
+
+
+def _clarification_event(result: ClarificationRequest, conversation_id: str | None) -> str:
+    """Register a clarification for the follow-up answer and format its SSE frame."""
+    request_id = f"clarify_{uuid.uuid4().hex[:12]}"
+    store_clarification_context(request_id, result)
+    return _sse({
+        "needs_clarification": True,
+        "clarification": {
+            "request_id": request_id,
+            "parameter_name": result.parameter_name,
+            "prompt": result.prompt,
+            "allowed_values": result.allowed_values,
+        },
+        "conversation_id": conversation_id,
+        "done": False,
+    })
+
 
 def _sanitized_error_event(error: Exception) -> str:
     """Build a sanitized SSE error payload with a correlation ID.
@@ -48,7 +145,7 @@ def _sanitized_error_event(error: Exception) -> str:
         "correlation_id": correlation_id,
         "done": True,
     }
-    return f"data: {json.dumps(payload)}\n\n"
+    return _sse(payload)
 
 
 def _format_step_event(step_event: dict) -> dict:
@@ -61,6 +158,44 @@ def _format_step_event(step_event: dict) -> dict:
     return result
 
 
+def _end_step_stream(step_queue: asyncio.Queue[dict]) -> None:
+    """Post the end sentinel, evicting the oldest step if the queue is full."""
+    try:
+        step_queue.put_nowait(_STEPS_DONE)
+    except asyncio.QueueFull:
+        step_queue.get_nowait()
+        step_queue.put_nowait(_STEPS_DONE)
+
+
+async def _stream_step_events(
+    work: asyncio.Task[Any], step_queue: asyncio.Queue[dict]
+) -> AsyncGenerator[str, None]:
+    """Yield step events as SSE frames while *work* runs.
+
+    Steps reach the client as the pipeline reports them rather than after it
+    returns.  The task posts a sentinel when it finishes, so this waits on the
+    queue without polling and stops right after the last step event.  The
+    task is cancelled if the stream is closed first.  Steps that are already
+    queued together are sent as one chunk.
+    """
+    work.add_done_callback(lambda _: _end_step_stream(step_queue))
+    try:
+        finished = False
+        while not finished:
+            step_events = [await step_queue.get()]
+            while not step_queue.empty():
+                step_events.append(step_queue.get_nowait())
+            # The sentinel is always the last event queued.
+            finished = step_events[-1] is _STEPS_DONE
+            if finished:
+                step_events.pop()
+            if step_events:
+                yield "".join(_sse(_format_step_event(evt)) for evt in step_events)
+    finally:
+        if not work.done():
+            work.cancel()
+
+
 async def generate_clarification_response_stream(
     clarification_ctx: ClarificationRequest,
     message: str,
@@ -81,11 +216,13 @@ async def generate_clarification_response_stream(
     from config.settings import get_settings
     from nl2sql_controller.pipeline import process_query
     from shared.protocols import QueueReporter
-    from workflow.clients import create_pipeline_clients
+    from workflow.clients import create_pipeline_clients, remember_agent_versions
 
-    step_queue: asyncio.Queue[dict] = asyncio.Queue()
+    step_queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=STEP_QUEUE_MAX_EVENTS)
     set_step_queue(step_queue)
-    set_request_user_id(user_id)
+    if user_id is not None:
+        # Anonymous requests already see the context default of None.
+        set_request_user_id(user_id)
 
     try:
         settings = get_settings()
@@ -107,15 +244,11 @@ async def generate_clarification_response_stream(
             },
         )
 
-        result = await process_query(request, clients)
-
-        # Drain step events
-        while not step_queue.empty():
-            try:
-                evt = step_queue.get_nowait()
-                yield (f"data: {json.dumps(_format_step_event(evt))}\n\n")
-            except asyncio.QueueEmpty:
-                break
+        work = asyncio.create_task(process_query(request, clients))
+        async for frame in _stream_step_events(work, step_queue):
+            yield frame
+        result = await work
+        remember_agent_versions(clients, settings)
 
         foundry_conversation_id = conversation_id
         logger.debug(
@@ -127,21 +260,7 @@ async def generate_clarification_response_stream(
 
         if isinstance(result, ClarificationRequest):
             # Another clarification needed
-            new_id = f"clarify_{uuid.uuid4().hex[:12]}"
-            store_clarification_context(new_id, result)
-
-            clarification_data = {
-                "needs_clarification": True,
-                "clarification": {
-                    "request_id": new_id,
-                    "parameter_name": result.parameter_name,
-                    "prompt": result.prompt,
-                    "allowed_values": result.allowed_values,
-                },
-                "done": False,
-            }
-            yield f"data: {json.dumps(clarification_data)}\n\n"
-            yield (f"data: {json.dumps({'steps_complete': True, 'done': False})}\n\n")
+            yield _clarification_event(result, foundry_conversation_id) + _STEPS_COMPLETE_EVENT
         else:
             # NL2SQLResponse
             response = result
@@ -167,12 +286,7 @@ async def generate_clarification_response_stream(
                 },
             }
 
-            yield (
-                "data: "
-                f"{json.dumps({'tool_call': tool_call, 'done': False, 'conversation_id': foundry_conversation_id})}"
-                "\n\n"
-            )
-            yield (f"data: {json.dumps({'steps_complete': True, 'done': False})}\n\n")
+            yield _tool_call_event(tool_call, foundry_conversation_id) + _STEPS_COMPLETE_EVENT
 
             # Update assistant context if cached
             assistant = get_assistant(foundry_conversation_id)
@@ -186,9 +300,7 @@ async def generate_clarification_response_stream(
                 if foundry_conversation_id:
                     store_assistant(foundry_conversation_id, assistant)
 
-        yield (
-            f"data: {json.dumps({'done': True, 'conversation_id': foundry_conversation_id})}\n\n"
-        )
+        yield _done_event(foundry_conversation_id)
         logger.debug(
             "[%s] Clarification stream done event emitted: conversation_id=%s",
             trace_id,
@@ -218,21 +330,23 @@ async def generate_orchestrator_streaming_response(
     from agent_framework_azure_ai import AzureAIClient
     from api.session_manager import get_assistant, store_assistant
     from assistant import DataAssistant, load_assistant_prompt
-    from azure.identity.aio import DefaultAzureCredential
     from config.settings import get_settings
     from nl2sql_controller.pipeline import (
         process_query,
         process_scenario_query,
     )
+    from shared.clients.credential import get_shared_credential
     from shared.protocols import QueueReporter
     from shared.scenario_constants import (
         TELEMETRY_EVENT_SCENARIO_ROUTED,
     )
-    from workflow.clients import create_pipeline_clients
+    from workflow.clients import create_pipeline_clients, remember_agent_versions
 
-    step_queue: asyncio.Queue[dict] = asyncio.Queue()
+    step_queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=STEP_QUEUE_MAX_EVENTS)
     set_step_queue(step_queue)
-    set_request_user_id(user_id)
+    if user_id is not None:
+        # Anonymous requests already see the context default of None.
+        set_request_user_id(user_id)
 
     try:
         logger.debug(
@@ -258,21 +372,13 @@ async def generate_orchestrator_streaming_response(
             if not endpoint:
                 raise ValueError("AZURE_AI_PROJECT_ENDPOINT not set")
 
-            client_id = settings.azure_client_id
-            if client_id:
-                credential = DefaultAzureCredential(
-                    managed_identity_client_id=client_id,
-                )
-            else:
-                credential = DefaultAzureCredential()
-
             orchestrator_model = (
                 settings.azure_ai_orchestrator_model or settings.azure_ai_model_deployment_name
             )
 
             ai_client = AzureAIClient(
                 project_endpoint=endpoint,
-                credential=credential,
+                credential=get_shared_credential(),
                 model_deployment_name=orchestrator_model,
                 use_latest_version=True,
             )
@@ -334,11 +440,11 @@ async def generate_orchestrator_streaming_response(
             )
 
         # Step 1: Classify intent
-        yield (f"data: {json.dumps({'step': 'Analyzing request...', 'status': 'started'})}\n\n")
+        yield _CLASSIFY_STARTED_EVENT
 
-        classify_start = time.time()
+        classify_start = time.perf_counter_ns()
         classification = await assistant.classify_intent(message)
-        classify_ms = int((time.time() - classify_start) * 1000)
+        classify_ms = (time.perf_counter_ns() - classify_start) // 1_000_000
         logger.debug(
             "[%s] Classification complete: intent=%s assistant_conversation_id=%s duration_ms=%d",
             trace_id,
@@ -347,57 +453,36 @@ async def generate_orchestrator_streaming_response(
             classify_ms,
         )
 
-        yield (
-            "data: "
-            f"{json.dumps({'step': 'Analyzing request...', 'status': 'completed', 'duration_ms': classify_ms})}"
-            "\n\n"
-        )
+        yield _sse({
+            "step": _CLASSIFY_STEP,
+            "status": "completed",
+            "duration_ms": classify_ms,
+        })
 
         if classification.intent == "conversation":
-            yield (
-                f"data: {json.dumps({'step': 'Generating response...', 'status': 'started'})}\n\n"
-            )
-            convo_start = time.time()
+            yield _CONVERSATION_STARTED_EVENT
+            convo_start = time.perf_counter_ns()
             response_text = await assistant.handle_conversation(message)
-            convo_ms = int((time.time() - convo_start) * 1000)
-            yield (
-                "data: "
-                f"{json.dumps({'step': 'Generating response...', 'status': 'completed', 'duration_ms': convo_ms})}"
-                "\n\n"
-            )
+            convo_ms = (time.perf_counter_ns() - convo_start) // 1_000_000
+            yield _sse({
+                "step": _CONVERSATION_STEP,
+                "status": "completed",
+                "duration_ms": convo_ms,
+            })
 
-            output = {
-                "text": response_text,
-                "conversation_id": assistant.conversation_id,
-            }
-            yield f"data: {json.dumps(output)}\n\n"
+            yield _text_event(response_text, assistant.conversation_id)
 
             # Append scenario discovery hints when the LLM signals capability inquiry
             if classification.scenario_discovery:
                 from shared.scenario_hints import build_discoverability_hint
 
                 hint = build_discoverability_hint()
-                tool_call = {
-                    "tool_name": "scenario_analysis",
-                    "tool_call_id": f"discovery_{uuid.uuid4().hex[:8]}",
-                    "args": {},
-                    "result": {
-                        "mode": "discovery",
-                        "scenario_type": "",
-                        "assumptions": [],
-                        "metrics": [],
-                        "summary_totals": {},
-                        "data_limitations": [],
-                        "visualization": None,
-                        "narrative": None,
-                        "prompt_hints": [hint.model_dump()],
-                    },
-                }
-                yield (
-                    "data: "
-                    f"{json.dumps({'tool_call': tool_call, 'done': False, 'conversation_id': assistant.conversation_id})}"
-                    "\n\n"
+                tool_call = _scenario_tool_call(
+                    f"discovery_{uuid.uuid4().hex[:8]}",
+                    mode="discovery",
+                    prompt_hints=[hint.model_dump()],
                 )
+                yield _tool_call_event(tool_call, assistant.conversation_id)
 
             logger.debug(
                 "[%s] Conversation response emitted: assistant_conversation_id=%s",
@@ -427,80 +512,51 @@ async def generate_orchestrator_streaming_response(
                 conversation_id=assistant.conversation_id,
             )
 
-            result = await process_scenario_query(
-                classification.scenario_intent,
-                assumption_set,
-                message,
-                clients,
+            work = asyncio.create_task(
+                process_scenario_query(
+                    classification.scenario_intent,
+                    assumption_set,
+                    message,
+                    clients,
+                )
             )
-
-            # Drain step events
-            while not step_queue.empty():
-                try:
-                    evt = step_queue.get_nowait()
-                    yield (f"data: {json.dumps(_format_step_event(evt))}\n\n")
-                except asyncio.QueueEmpty:
-                    break
+            async for frame in _stream_step_events(work, step_queue):
+                yield frame
+            result = await work
 
             # T025: Emit scenario_analysis tool result
             if result.scenario_result:
-                tool_call = {
-                    "tool_name": "scenario_analysis",
-                    "tool_call_id": f"scenario_{id(result)}",
-                    "args": {},
-                    "result": {
-                        "mode": "scenario",
-                        "scenario_type": result.scenario_type,
-                        "assumptions": [
-                            a.model_dump() for a in (result.scenario_assumptions or [])
-                        ],
-                        "metrics": [m.model_dump() for m in result.scenario_result.metrics],
-                        "summary_totals": (result.scenario_result.summary_totals),
-                        "data_limitations": (result.scenario_result.data_limitations),
-                        "visualization": (
-                            result.scenario_visualization.model_dump()
-                            if result.scenario_visualization
-                            else None
-                        ),
-                        "narrative": (
-                            result.scenario_narrative.model_dump()
-                            if result.scenario_narrative
-                            else None
-                        ),
-                        "prompt_hints": [h.model_dump() for h in (result.scenario_hints or [])],
-                    },
-                }
-                yield (
-                    "data: "
-                    f"{json.dumps({'tool_call': tool_call, 'done': False, 'conversation_id': assistant.conversation_id})}"
-                    "\n\n"
+                tool_call = _scenario_tool_call(
+                    f"scenario_{id(result)}",
+                    scenario_type=result.scenario_type,
+                    prompt_hints=[h.model_dump() for h in (result.scenario_hints or [])],
+                    assumptions=[a.model_dump() for a in (result.scenario_assumptions or [])],
+                    metrics=[m.model_dump() for m in result.scenario_result.metrics],
+                    summary_totals=result.scenario_result.summary_totals,
+                    data_limitations=result.scenario_result.data_limitations,
+                    visualization=(
+                        result.scenario_visualization.model_dump()
+                        if result.scenario_visualization
+                        else None
+                    ),
+                    narrative=(
+                        result.scenario_narrative.model_dump()
+                        if result.scenario_narrative
+                        else None
+                    ),
                 )
+                yield _tool_call_event(tool_call, assistant.conversation_id)
             elif result.scenario_hints:
                 # Incomplete scenario: no computation, just clarification hints
-                tool_call = {
-                    "tool_name": "scenario_analysis",
-                    "tool_call_id": f"scenario_{id(result)}",
-                    "args": {},
-                    "result": {
-                        "mode": "scenario",
-                        "scenario_type": result.scenario_type,
-                        "assumptions": [],
-                        "metrics": [],
-                        "summary_totals": {},
-                        "data_limitations": [],
-                        "visualization": None,
-                        "narrative": None,
-                        "prompt_hints": [h.model_dump() for h in result.scenario_hints],
-                    },
-                }
-                yield (
-                    "data: "
-                    f"{json.dumps({'tool_call': tool_call, 'done': False, 'conversation_id': assistant.conversation_id})}"
-                    "\n\n"
+                tool_call = _scenario_tool_call(
+                    f"scenario_{id(result)}",
+                    scenario_type=result.scenario_type,
+                    prompt_hints=[h.model_dump() for h in result.scenario_hints],
                 )
+                yield _tool_call_event(tool_call, assistant.conversation_id)
             else:
                 output = assistant.render_response(result)
-                yield f"data: {json.dumps(output)}\n\n"
+                yield _sse(output)
 
             if assistant.conversation_id:
                 store_assistant(assistant.conversation_id, assistant)
@@ -522,39 +578,20 @@ async def generate_orchestrator_streaming_response(
                 conversation_id=assistant.conversation_id,
             )
 
-            result = await process_query(nl2sql_request, clients)
-
-            # Drain step events
-            while not step_queue.empty():
-                try:
-                    evt = step_queue.get_nowait()
-                    yield (f"data: {json.dumps(_format_step_event(evt))}\n\n")
-                except asyncio.QueueEmpty:
-                    break
+            work = asyncio.create_task(process_query(nl2sql_request, clients))
+            async for frame in _stream_step_events(work, step_queue):
+                yield frame
+            result = await work
+            remember_agent_versions(clients, settings)
 
             if isinstance(result, ClarificationRequest):
-                req_id = f"clarify_{uuid.uuid4().hex[:12]}"
-                store_clarification_context(req_id, result)
-
-                clarification_data = {
-                    "needs_clarification": True,
-                    "clarification": {
-                        "request_id": req_id,
-                        "parameter_name": result.parameter_name,
-                        "prompt": result.prompt,
-                        "allowed_values": (result.allowed_values),
-                    },
-                    "conversation_id": assistant.conversation_id,
-                    "done": False,
-                }
-                yield (f"data: {json.dumps(clarification_data)}\n\n")
-                yield (f"data: {json.dumps({'steps_complete': True, 'done': False})}\n\n")
-
                 if assistant.conversation_id:
                     store_assistant(assistant.conversation_id, assistant)
 
                 yield (
-                    f"data: {json.dumps({'done': True, 'conversation_id': assistant.conversation_id})}\n\n"
+                    _clarification_event(result, assistant.conversation_id)
+                    + _STEPS_COMPLETE_EVENT
+                    + _done_event(assistant.conversation_id)
                 )
                 return
 
@@ -571,16 +608,14 @@ async def generate_orchestrator_streaming_response(
                 store_assistant(assistant.conversation_id, assistant)
 
             output = assistant.render_response(response)
-            yield f"data: {json.dumps(output)}\n\n"
+            yield _sse(output)
             logger.debug(
                 "[%s] Data response emitted: assistant_conversation_id=%s",
                 trace_id,
                 assistant.conversation_id,
             )
 
-        yield (
-            f"data: {json.dumps({'done': True, 'conversation_id': assistant.conversation_id})}\n\n"
-        )
+        yield _done_event(assistant.conversation_id)
         logger.debug(
             "[%s] Done event emitted: conversation_id=%s", trace_id, assistant.conversation_id
         )
@@ -11,6 +11,7 @@ from api.dependencies import (
     get_conversation_title,
     get_project_client,
     get_user_id,
+    invalidate_conversation,
     verify_conversation_ownership,
 )
 from api.models import (
@@ -121,6 +122,7 @@ async def update_conversation(
     try:
         openai_client = project_client.get_openai_client()
         openai_client.conversations.update(conversation_id, metadata=metadata)
+        invalidate_conversation(conversation_id)
     except Exception as e:
         logger.exception("Error updating conversation %s", conversation_id)
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -142,6 +144,7 @@ async def delete_conversation(
     try:
         openai_client = project_client.get_openai_client()
         openai_client.conversations.delete(conversation_id)
+        invalidate_conversation(conversation_id)
     except Exception as e:
         logger.exception("Error deleting conversation %s", conversation_id)
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -174,8 +177,8 @@ async def get_conversation_messages(
             if not content.strip():
                 continue
 
-            role: str | Any = getattr(item, "role", "unknown")
-            role = str(role.value) if hasattr(role, "value") else str(role)  # type: ignore[union-attr]
+            role_attr: Any = getattr(item, "role", "unknown")
+            role = str(getattr(role_attr, "value", role_attr))
 
             # Deduplicate by role + content
             content_key = (role, content)
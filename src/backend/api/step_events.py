@@ -21,9 +21,7 @@ logger = logging.getLogger(__name__)
 _step_queue_var: ContextVar[asyncio.Queue | None] = ContextVar("step_queue", default=None)
 
 # Track step start times for duration calculation
-_step_start_times: ContextVar[dict[str, float] | None] = ContextVar(
-    "step_start_times", default=None
-)
+_step_start_times: ContextVar[dict[str, int] | None] = ContextVar("step_start_times", default=None)
 
 # Context variable to hold the current user_id for this request
 # This allows executors to access the authenticated user when creating conversations
@@ -57,7 +55,7 @@ def clear_step_queue() -> None:
     _step_start_times.set(None)
 
 
-def _get_start_times() -> dict[str, float]:
+def _get_start_times() -> dict[str, int]:
     """Get the step start times dict, creating if needed."""
     times = _step_start_times.get()
     if times is None:
@@ -66,21 +64,6 @@ def _get_start_times() -> dict[str, float]:
     return times
 
 
-async def emit_step(step: str) -> None:
-    """
-    Emit a step event to the current request's queue (async version).
-
-    This can be called from async code within the request context
-    (tools, executors, etc.) to send progress updates to the client.
-
-    Args:
-        step: The step message to emit (e.g., "Searching cached queries...")
-    """
-    queue = get_step_queue()
-    if queue:
-        await queue.put({"step": step, "status": "started", "start_time": time.time()})
-
-
 def emit_step_start(step: str) -> None:
     """
     Emit a step start event. Call this when a tool/operation begins.
@@ -89,22 +72,21 @@ def emit_step_start(step: str) -> None:
         step: The step message (e.g., "Searching cached queries...")
     """
     queue = get_step_queue()
-    start_time = time.time()
 
-    logger.info("emit_step_start called with '%s', queue=%s", step, queue)
+    logger.debug("emit_step_start called with '%s', queue=%s", step, queue)
 
     if queue:
         try:
             # Track start time for duration calculation
             start_times = _get_start_times()
-            start_times[step] = start_time
+            start_times[step] = time.perf_counter_ns()
 
             queue.put_nowait({
                 "step": step,
                 "status": "started",
-                "start_time": start_time,
+                "start_time": time.time(),
             })
-            logger.info("Step start event queued: %s", step)
+            logger.debug("Step start event queued: %s", step)
         except asyncio.QueueFull:
             logger.warning("Step queue full, dropping start event: %s", step)
     else:
@@ -119,23 +101,23 @@ def emit_step_end(step: str) -> None:
         step: The step message (must match the start event)
     """
     queue = get_step_queue()
-    end_time = time.time()
+    end_ns = time.perf_counter_ns()
 
-    logger.info("emit_step_end called with '%s', queue=%s", step, queue)
+    logger.debug("emit_step_end called with '%s', queue=%s", step, queue)
 
     if queue:
         try:
             # Calculate duration from start time
             start_times = _get_start_times()
-            start_time = start_times.pop(step, None)
-            duration_ms = int((end_time - start_time) * 1000) if start_time else None
+            start_ns = start_times.pop(step, None)
+            duration_ms = (end_ns - start_ns) // 1_000_000 if start_ns is not None else None
 
             queue.put_nowait({
                 "step": step,
                 "status": "completed",
                 "duration_ms": duration_ms,
             })
-            logger.info("Step end event queued: %s (duration: %sms)", step, duration_ms)
+            logger.debug("Step end event queued: %s (duration: %sms)", step, duration_ms)
         except asyncio.QueueFull:
             logger.warning("Step queue full, dropping end event: %s", step)
     else:
@@ -152,11 +134,11 @@ def emit_step_sync(step: str) -> None:
         step: The step message to emit
     """
     queue = get_step_queue()
-    logger.info("emit_step_sync called with '%s', queue=%s", step, queue)
+    logger.debug("emit_step_sync called with '%s', queue=%s", step, queue)
     if queue:
         try:
             queue.put_nowait({"step": step, "status": "started"})
-            logger.info("Step event queued successfully: %s", step)
+            logger.debug("Step event queued successfully: %s", step)
         except asyncio.QueueFull:
             logger.warning("Step queue full, dropping event: %s", step)
     else:
@@ -9,6 +9,7 @@ import json
 import logging
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -30,6 +31,16 @@ from shared.scenario_constants import (
 
 logger = logging.getLogger(__name__)
 
+_JSON_DECODER = json.JSONDecoder()
+
+# Keyword alternations checked in priority order by
+# DataAssistant._infer_scenario_type; the first pattern that matches wins.
+_SCENARIO_TYPE_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"demand|volume|order", re.IGNORECASE), SCENARIO_TYPE_DEMAND),
+    (re.compile(r"supplier|purchasing", re.IGNORECASE), SCENARIO_TYPE_SUPPLIER_COST),
+    (re.compile(r"inventory|reorder|stock", re.IGNORECASE), SCENARIO_TYPE_INVENTORY_POLICY),
+)
+
 SCHEMA_SUGGESTIONS: dict[str, list[SchemaSuggestion]] = {
     "sales": [
         SchemaSuggestion(
@@ -156,12 +167,17 @@ class ClassificationResult:
     scenario_discovery: bool = False  # LLM signals user is asking about scenario capabilities
 
 
+_PROMPT_PATH = Path(__file__).parent / "assistant_prompt.md"
+
+
+@lru_cache(maxsize=1)
 def load_assistant_prompt() -> str:
-    """Load the DataAssistant instructions prompt."""
-    prompt_path = Path(__file__).parent / "assistant_prompt.md"
-    if not prompt_path.exists():
-        raise FileNotFoundError(f"Prompt not found: {prompt_path}")
-    return prompt_path.read_text(encoding="utf-8")
+    """Load the DataAssistant instructions prompt.
+
+    The file is read once per process; call
+    ``load_assistant_prompt.cache_clear()`` to pick up edits without restarting.
+    """
+    return _PROMPT_PATH.read_text(encoding="utf-8")
 
 
 class DataAssistant:
@@ -186,15 +202,21 @@ class DataAssistant:
         self.context = ConversationContext()
         self._thread: AgentSession | None = None
         self._initial_conversation_id = conversation_id
+        # Service-assigned conversation ID, remembered once the session has one
+        self._service_conversation_id: str | None = None
 
         logger.debug("DataAssistant initialized (conversation_id=%s)", conversation_id)
 
     @property
     def conversation_id(self) -> str | None:
         """Get the current Foundry conversation ID."""
+        if self._service_conversation_id:
+            return self._service_conversation_id
         if self._thread:
             service_session_id = getattr(self._thread, "service_session_id", None)
             if service_session_id:
+                # The service never reassigns the ID, so skip the lookup next time
+                self._service_conversation_id = service_session_id
                 return service_session_id
             return self._thread.session_id
         return self._initial_conversation_id
@@ -335,9 +357,9 @@ JSON response:"""
 
         try:
             json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
-            if json_start >= 0 and json_end > json_start:
-                parsed = json.loads(response_text[json_start:json_end])
+            if json_start >= 0:
+                # Decode only the first object; trailing prose or fences are ignored.
+                parsed, _ = _JSON_DECODER.raw_decode(response_text, json_start)
 
                 intent = parsed.get("intent", "conversation")
                 query = parsed.get("query", user_message)
@@ -376,9 +398,9 @@ JSON response:"""
                         intent = "data_query"
 
                 logger.debug(
-                    "Classified intent: %s (query=%s, overrides=%s, confirmation_action=%s, conversation_id=%s)",
+                    "Classified intent: %s (query=%.50s, overrides=%s, confirmation_action=%s, conversation_id=%s)",
                     intent,
-                    query[:50],
+                    query,
                     overrides,
                     confirmation_action,
                     self.conversation_id,
@@ -470,13 +492,10 @@ JSON response:"""
         Returns:
             A supported scenario type constant.
         """
-        text = " ".join(detected_patterns).lower()
-        if any(kw in text for kw in ("demand", "volume", "order")):
-            return SCENARIO_TYPE_DEMAND
-        if any(kw in text for kw in ("supplier", "purchasing")):
-            return SCENARIO_TYPE_SUPPLIER_COST
-        if any(kw in text for kw in ("inventory", "reorder", "stock")):
-            return SCENARIO_TYPE_INVENTORY_POLICY
+        text = " ".join(detected_patterns)
+        for pattern, scenario_type in _SCENARIO_TYPE_PATTERNS:
+            if pattern.search(text):
+                return scenario_type
         return SCENARIO_TYPE_PRICE
 
     def build_scenario_assumption_set(
@@ -689,12 +708,13 @@ JSON response:"""
         lines.append(f"**Query Results** ({response.row_count} rows)\n")
 
         if response.columns and response.sql_response:
-            lines.append("| " + " | ".join(response.columns) + " |")
-            lines.append("| " + " | ".join(["---"] * len(response.columns)) + " |")
-
-            for row in response.sql_response[:10]:
-                values = [str(row.get(col, "")) for col in response.columns]
-                lines.append("| " + " | ".join(values) + " |")
+            columns = response.columns
+            lines.append(f"| {' | '.join(columns)} |")
+            lines.append(f"|{' --- |' * len(columns)}")
+            lines.extend(
+                f"| {' | '.join([str(row.get(col, '')) for col in columns])} |"
+                for row in response.sql_response[:10]
+            )
 
         if response.sql_query:
             lines.append(
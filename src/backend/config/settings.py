@@ -47,6 +47,12 @@ class Settings(BaseSettings):
     azure_ai_embedding_deployment: str = "embedding-small"
     """Embedding model deployment name."""
 
+    azure_ai_embedding_dimensions: int | None = None
+    """Truncated embedding size (text-embedding-3 ``dimensions``); None → model default.
+
+    Must match the ``content_vector`` dimensions of the search indexes.
+    """
+
     azure_client_id: str | None = None
     """Managed-identity client ID (None → system-assigned)."""
 
@@ -63,6 +69,15 @@ class Settings(BaseSettings):
     azure_sql_database: str = "WideWorldImporters"
     """Target database name."""
 
+    azure_sql_pool_max_size: int = 10
+    """Maximum pooled connections, and ODBC worker threads, per (server, database)."""
+
+    azure_sql_max_rows: int = 5000
+    """Maximum rows fetched per query; larger results are truncated."""
+
+    azure_sql_result_cache_ttl_seconds: float = 60.0
+    """How long identical read-only query results are reused (0 disables)."""
+
     # -- Thresholds / Tuning -----------------------------------------------
 
     query_template_confidence_threshold: float = 0.80
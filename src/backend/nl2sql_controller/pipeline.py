@@ -37,7 +37,7 @@ from models import (
 )
 from parameter_extractor.extractor import extract_parameters
 from parameter_validator.validator import validate_parameters
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 from query_builder.builder import build_query
 from query_validator.validator import validate_query
 from shared.column_filter import refine_columns
@@ -61,6 +61,9 @@ _CONFIDENCE_THRESHOLD_HIGH = 0.85
 _CONFIDENCE_THRESHOLD_LOW = 0.6
 _DYNAMIC_CONFIDENCE_THRESHOLD = 0.7
 
+# Validates previous_tables_json straight from JSON text in one pass
+_TABLES_ADAPTER = TypeAdapter(list[TableMetadata])
+
 
 # ── Helper functions (ported from executor.py) ───────────────────────────
 
@@ -474,6 +477,8 @@ async def _run_template_pipeline(
     extraction_req: ParameterExtractionRequest,
     template: QueryTemplate,
     clients: PipelineClients,
+    *,
+    cache_draft: bool = False,
 ) -> NL2SQLResponse | ClarificationRequest:
     """Shared extraction → validation → execution pipeline.
 
@@ -483,6 +488,8 @@ async def _run_template_pipeline(
         extraction_req: Prepared extraction request.
         template: The query template being used.
         clients: Pipeline I/O dependencies.
+        cache_draft: Store the validated draft in
+            ``clients.template_draft_cache`` (fresh questions only).
 
     Returns:
         Final response or clarification request.
@@ -549,6 +556,9 @@ async def _run_template_pipeline(
             error_suggestions=suggestions,
         )
 
+    if cache_draft and clients.template_draft_cache is not None:
+        clients.template_draft_cache.put(template.id, extraction_req.user_query, draft)
+
     # 6. Execute
     return await _execute_and_respond(draft, clients)
 
@@ -560,6 +570,9 @@ async def _template_path(
 ) -> NL2SQLResponse | ClarificationRequest:
     """Process a high-confidence template match.
 
+    Repeats of a question already answered with this template reuse the
+    cached validated draft and skip parameter extraction entirely.
+
     Args:
         request: The user's original request.
         template: Matched query template.
@@ -568,11 +581,17 @@ async def _template_path(
     Returns:
         Final response or clarification request.
     """
+    if clients.template_draft_cache is not None:
+        cached = clients.template_draft_cache.get(template.id, request.user_query)
+        if cached is not None:
+            logger.info("Reusing cached draft for template '%s'", template.intent)
+            return await _execute_and_respond(cached, clients)
+
     extraction_req = ParameterExtractionRequest(
         user_query=request.user_query,
         template=template,
     )
-    return await _run_template_pipeline(extraction_req, template, clients)
+    return await _run_template_pipeline(extraction_req, template, clients, cache_draft=True)
 
 
 async def _handle_template_refinement(
@@ -810,13 +829,12 @@ async def _handle_dynamic_refinement(
 
     if request.previous_tables_json:
         try:
-            tables_data = json.loads(request.previous_tables_json)
-            tables = [TableMetadata.model_validate(t) for t in tables_data]
+            tables = _TABLES_ADAPTER.validate_json(request.previous_tables_json)
             logger.info(
                 "Re-using %d tables from previous query context",
                 len(tables),
             )
-        except (json.JSONDecodeError, ValidationError) as exc:
+        except ValidationError as exc:
             logger.warning("Failed to parse previous tables JSON: %s", exc)
 
     if not tables:
@@ -6,16 +6,24 @@ SQL template tokens using LLM-based analysis.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 from agent_framework import Agent
 from agent_framework_azure_ai import AzureAIClient
-from azure.identity.aio import DefaultAzureCredential
+from shared.clients.credential import get_shared_credential
 
+_PROMPT_PATH = Path(__file__).parent / "prompt.md"
 
+
+@lru_cache(maxsize=1)
 def load_prompt() -> str:
-    """Load the prompt from prompt.md in this folder."""
-    return (Path(__file__).parent / "prompt.md").read_text(encoding="utf-8")
+    """Load the prompt from prompt.md in this folder.
+
+    The file is read once per process; call ``load_prompt.cache_clear()``
+    to pick up edits without restarting.
+    """
+    return _PROMPT_PATH.read_text(encoding="utf-8")
 
 
 def create_param_extractor_agent(
@@ -48,13 +56,8 @@ def _create_agent() -> Agent:
             "Set it to your Azure AI Foundry project endpoint."
         )
 
-    # Create chat client with Azure credential
-    # Use AZURE_CLIENT_ID for user-assigned managed identity in Container Apps
-    client_id = os.getenv("AZURE_CLIENT_ID")
-    if client_id:
-        credential = DefaultAzureCredential(managed_identity_client_id=client_id)
-    else:
-        credential = DefaultAzureCredential()
+    # Reuse the process-wide credential rather than probing the chain again
+    credential = get_shared_credential()
 
     # Use a potentially smaller/faster model for parameter extraction
     default_model = os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME")
@@ -79,5 +82,15 @@ def _create_agent() -> Agent:
     )
 
 
-# Create agent at module level
-agent = _create_agent()
+@lru_cache(maxsize=1)
+def get_agent() -> Agent:
+    """Return the standalone agent, creating it on first use."""
+    return _create_agent()
+
+
+def __getattr__(name: str) -> Agent:
+    # ``agent`` is built on first access rather than at import, so importing
+    # the factory helpers above needs no Azure settings and builds no client.
+    if name == "agent":
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
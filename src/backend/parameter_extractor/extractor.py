@@ -7,6 +7,7 @@ via the ``ProgressReporter`` protocol.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
@@ -29,6 +30,11 @@ logger = logging.getLogger(__name__)
 
 MIN_PARAM_NAME_LENGTH = 2
 
+# Body of the first ```json fenced block in an LLM response
+_JSON_FENCE_RE = re.compile(r"```json\s*(.*?)```", re.DOTALL)
+# A JSON object with no nested braces, the last-resort parse target
+_FLAT_JSON_OBJECT_RE = re.compile(r"\{[^{}]*\}")
+
 
 # ============================================================================
 # Deterministic Fuzzy Matching (Step 1 - before LLM)
@@ -341,25 +347,23 @@ def _parse_llm_response(response_text: str) -> dict[str, Any]:
     """
     text = response_text.strip()
 
-    # Try direct JSON parse first
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
+    # Try direct JSON parse first; prose or a code fence can't parse, so skip the attempt
+    if text.startswith("{"):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
 
     # Try to extract from markdown code fence
-    if "```json" in text:
+    fence_match = _JSON_FENCE_RE.search(text)
+    if fence_match:
         try:
-            start = text.find("```json") + 7
-            end = text.find("```", start)
-            if end > start:
-                json_str = text[start:end].strip()
-                return json.loads(json_str)
-        except (json.JSONDecodeError, ValueError):
+            return json.loads(fence_match.group(1))
+        except json.JSONDecodeError:
             pass
 
     # Try to find any JSON object in the response
-    json_match = re.search(r"\{[^{}]*\}", text, re.DOTALL)
+    json_match = _FLAT_JSON_OBJECT_RE.search(text)
     if json_match:
         try:
             return json.loads(json_match.group())
@@ -383,9 +387,9 @@ async def _hydrate_database_allowed_values(
 
     Iterates ``template.parameters`` and, for each with
     ``allowed_values_source == "database"``, fetches distinct values via
-    the ``AllowedValuesProvider``.  Results are written directly into
-    ``param.validation.allowed_values`` so that downstream prompt-building
-    and fuzzy-matching work transparently.
+    the ``AllowedValuesProvider`` (all columns concurrently).  Results are
+    written directly into ``param.validation.allowed_values`` so that
+    downstream prompt-building and fuzzy-matching work transparently.
 
     Args:
         template: The query template whose parameters may need hydration.
@@ -396,11 +400,19 @@ async def _hydrate_database_allowed_values(
     """
     partial_cache_params: set[str] = set()
 
-    for param in template.parameters:
-        if param.allowed_values_source != "database" or param.table is None or param.column is None:
-            continue
+    db_params = [
+        (param, param.table, param.column)
+        for param in template.parameters
+        if param.allowed_values_source == "database"
+        and param.table is not None
+        and param.column is not None
+    ]
+    # Cold-cache loads are independent DB round-trips; issue them together.
+    results = await asyncio.gather(
+        *(provider.get_allowed_values(table, column) for _, table, column in db_params)
+    )
 
-        result = await provider.get_allowed_values(param.table, param.column)
+    for (param, _, _), result in zip(db_params, results, strict=True):
         if result is None:
             logger.warning(
                 "Could not load allowed values for %s.%s — falling back to LLM-only",
@@ -495,9 +507,9 @@ async def _extract_parameters_inner(
         )
 
     logger.info(
-        "Extracting parameters for template '%s' from query: %s",
+        "Extracting parameters for template '%s' from query: %.100s",
         template.intent,
-        user_query[:100],
+        user_query,
     )
 
     # ================================================================
@@ -574,10 +586,7 @@ async def _extract_parameters_inner(
             if response_text:
                 break
 
-    logger.info(
-        "LLM response: %s",
-        response_text[:500] if response_text else "(empty)",
-    )
+    logger.info("LLM response: %.500s", response_text or "(empty)")
 
     parsed = _parse_llm_response(response_text)
     logger.info(
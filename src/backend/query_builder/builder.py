@@ -13,10 +13,19 @@ from typing import Any
 
 from agent_framework import Agent, AgentSession
 from models import QueryBuilderRequest, SQLDraft, TableMetadata
+from pydantic import TypeAdapter
 from shared.protocols import NoOpReporter, ProgressReporter
 
 logger = logging.getLogger(__name__)
 
+# Serializes table metadata for refinements without an intermediate dict pass
+_TABLES_ADAPTER = TypeAdapter(list[TableMetadata])
+
+# Body of the first ```json fenced block in an LLM response
+_JSON_FENCE_RE = re.compile(r"```json\s*(.*?)```", re.DOTALL)
+# A JSON object with no nested braces, the last-resort parse target
+_FLAT_JSON_OBJECT_RE = re.compile(r"\{[^{}]*\}")
+
 
 def _looks_like_sql(value: str) -> bool:
     """Return True when text appears to contain a SQL SELECT/WITH statement."""
@@ -153,21 +162,19 @@ def _parse_llm_response(response_text: str) -> dict[str, Any]:
     """
     text = response_text.strip()
 
-    # Direct JSON parse
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
+    # Direct JSON parse; prose or a code fence can't parse, so skip the attempt
+    if text.startswith("{"):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
 
     # Extract from markdown code fence
-    if "```json" in text:
+    fence_match = _JSON_FENCE_RE.search(text)
+    if fence_match:
         try:
-            start = text.find("```json") + 7
-            end = text.find("```", start)
-            if end > start:
-                json_str = text[start:end].strip()
-                return json.loads(json_str)
-        except (json.JSONDecodeError, ValueError):
+            return json.loads(fence_match.group(1))
+        except json.JSONDecodeError:
             pass
 
     # Extract from first '{' to last '}' (handles nested JSON objects)
@@ -180,7 +187,7 @@ def _parse_llm_response(response_text: str) -> dict[str, Any]:
             pass
 
     # Regex search for any JSON object
-    json_match = re.search(r"\{[^{}]*\}", text, re.DOTALL)
+    json_match = _FLAT_JSON_OBJECT_RE.search(text)
     if json_match:
         try:
             return json.loads(json_match.group())
@@ -219,9 +226,9 @@ async def build_query(
         retry_count = request.retry_count
 
         logger.info(
-            "Building query from %d tables for: %s (retry=%d)",
+            "Building query from %d tables for: %.100s (retry=%d)",
             len(tables),
-            user_query[:100],
+            user_query,
             retry_count,
         )
 
@@ -258,7 +265,7 @@ async def build_query(
             "Failed to parse LLM response:"
         )
 
-        tables_metadata_json = json.dumps([t.model_dump() for t in tables])
+        tables_metadata_json = _TABLES_ADAPTER.dump_json(tables).decode()
 
         success_statuses = {"success", "ok", "completed", "done"}
         if status in success_statuses or (
@@ -286,10 +293,10 @@ async def build_query(
         if not error_message:
             keys = sorted(parsed.keys())
             logger.warning(
-                "QueryBuilder returned unexpected schema (status=%s, keys=%s, sample=%s)",
+                "QueryBuilder returned unexpected schema (status=%s, keys=%s, sample=%.300s)",
                 status or "<missing>",
                 keys,
-                response_text[:300],
+                response_text,
             )
             error_message = "Query generation failed due to unexpected model response format"
 
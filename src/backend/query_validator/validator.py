@@ -56,6 +56,11 @@ DANGEROUS_KEYWORDS = [
 
 _MIN_WRAPPED_IDENTIFIER_LENGTH = 2
 
+# Leading statement keyword, matched in place instead of upper-casing the query
+_STATEMENT_TYPE_RE = re.compile(
+    r"\s*(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER)", re.IGNORECASE
+)
+
 
 def _split_select_items(select_clause: str) -> list[str]:
     """Split a SELECT projection clause into top-level comma-separated items."""
@@ -364,24 +369,8 @@ def _check_statement_type(sql: str) -> tuple[str, bool, list[str]]:
         Tuple of (statement_type, is_single_statement, list of violations).
     """
     violations: list[str] = []
-    sql_upper = sql.strip().upper()
-
-    if sql_upper.startswith("SELECT"):
-        statement_type = "SELECT"
-    elif sql_upper.startswith("INSERT"):
-        statement_type = "INSERT"
-    elif sql_upper.startswith("UPDATE"):
-        statement_type = "UPDATE"
-    elif sql_upper.startswith("DELETE"):
-        statement_type = "DELETE"
-    elif sql_upper.startswith("DROP"):
-        statement_type = "DROP"
-    elif sql_upper.startswith("CREATE"):
-        statement_type = "CREATE"
-    elif sql_upper.startswith("ALTER"):
-        statement_type = "ALTER"
-    else:
-        statement_type = "UNKNOWN"
+    statement_match = _STATEMENT_TYPE_RE.match(sql)
+    statement_type = statement_match.group(1).upper() if statement_match else "UNKNOWN"
 
     if statement_type != "SELECT":
         violations.append(f"Statement type is {statement_type}, must be SELECT")
@@ -478,7 +467,7 @@ def validate_query(draft: SQLDraft, allowed_tables: set[str]) -> SQLDraft:
     try:
         sql_query = draft.completed_sql or ""
 
-        logger.info("Validating query: %s", sql_query[:200] if sql_query else "(empty)")
+        logger.info("Validating query: %.200s", sql_query or "(empty)")
 
         all_violations: list[str] = []
         all_warnings: list[str] = []
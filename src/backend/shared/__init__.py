@@ -1,12 +1,13 @@
 """Shared utilities for agents."""
 
 from .clients import AzureSearchClient, AzureSqlClient
-from .tools import execute_sql, search_query_templates, search_tables
+from .tools import execute_sql, execute_sql_batch, search_query_templates, search_tables
 
 __all__ = [
     "AzureSearchClient",
     "AzureSqlClient",
     "execute_sql",
+    "execute_sql_batch",
     "search_query_templates",
     "search_tables",
 ]
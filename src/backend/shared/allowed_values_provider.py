@@ -164,7 +164,7 @@ class AllowedValuesProvider:
                 f"FROM {table} ORDER BY [{column}]"
             )
             async with AzureSqlClient(
-                server=self._server, database=self._database, read_only=True
+                server=self._server, database=self._database, read_only=True, columnar=True
             ) as client:
                 result: dict[str, Any] = await client.execute_query(query)
 
@@ -172,9 +172,9 @@ class AllowedValuesProvider:
                 logger.warning("DB query failed for %s.%s: %s", table, column, result.get("error"))
                 return None
 
-            rows: list[dict[str, Any]] = result.get("rows", [])
-            is_partial = len(rows) > self._max_values
-            values = [str(row[column]) for row in rows[: self._max_values] if row.get(column)]
+            data: list[list[Any]] = result.get("data") or [[]]
+            is_partial = len(data[0]) > self._max_values
+            values = [str(value) for value in data[0][: self._max_values] if value]
 
             self._cache[key] = _CacheEntry(
                 values=values, loaded_at=time.monotonic(), is_partial=is_partial
@@ -1,6 +1,16 @@
 """Shared clients for Azure services."""
 
-from .search_client import AzureSearchClient
-from .sql_client import AzureSqlClient
+from .credential import close_shared_credential, get_shared_credential
+from .search_client import AzureSearchClient, close_openai_clients, warm_up_search
+from .sql_client import AzureSqlClient, close_sql_pools, get_sql_pool
 
-__all__ = ["AzureSearchClient", "AzureSqlClient"]
+__all__ = [
+    "AzureSearchClient",
+    "AzureSqlClient",
+    "close_openai_clients",
+    "close_shared_credential",
+    "close_sql_pools",
+    "get_shared_credential",
+    "get_sql_pool",
+    "warm_up_search",
+]
@@ -0,0 +1,52 @@
+"""
+Process-wide Azure AD credential for the async Azure clients.
+
+``DefaultAzureCredential`` probes the whole credential chain when it is
+built and keeps its token cache per instance, so constructing one per
+request means a fresh token acquisition (an IMDS call in Container Apps,
+an ``az`` subprocess locally) on every request. All async clients share
+the single instance returned by ``get_shared_credential()`` instead; it
+is closed once by the FastAPI lifespan on shutdown.
+"""
+
+import logging
+
+from azure.identity.aio import DefaultAzureCredential
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_shared_credential: DefaultAzureCredential | None = None
+
+
+def get_shared_credential() -> DefaultAzureCredential:
+    """Return the process-wide async credential, creating it on first use.
+
+    Uses ``AZURE_CLIENT_ID`` for user-assigned managed identity in Container
+    Apps; locally the credential chain falls back to CLI/VS Code credentials.
+    Construction does not await, so no lock is needed on the event loop.
+
+    Returns:
+        The shared ``DefaultAzureCredential`` instance.
+    """
+    global _shared_credential
+    if _shared_credential is None:
+        client_id = get_settings().azure_client_id
+        if client_id:
+            _shared_credential = DefaultAzureCredential(managed_identity_client_id=client_id)
+        else:
+            _shared_credential = DefaultAzureCredential()
+        logger.info("Created shared Azure credential (managed_identity=%s)", bool(client_id))
+    return _shared_credential
+
+
+async def close_shared_credential() -> None:
+    """Close the shared credential, if one was created.
+
+    Call this from application shutdown only; clients must never close the
+    shared credential at the end of a request.
+    """
+    global _shared_credential
+    if _shared_credential is not None:
+        await _shared_credential.close()
+        _shared_credential = None
@@ -5,19 +5,74 @@ This module provides a reusable async client for searching Azure AI Search index
 with vector embeddings generated via Azure OpenAI.
 """
 
+import hashlib
 import logging
-import os
 import re
+from array import array
+from collections import OrderedDict
 from types import TracebackType
 from typing import Any, Self
 
-from azure.identity.aio import DefaultAzureCredential
+from azure.identity.aio import get_bearer_token_provider
 from azure.search.documents.aio import SearchClient
 from azure.search.documents.models import VectorizedQuery
+from config.settings import get_settings
 from openai import AsyncAzureOpenAI
 
+from .credential import get_shared_credential
+
 logger = logging.getLogger(__name__)
 
+# Process-wide LRU cache of query embeddings, keyed by a digest of the
+# deployment name and the whitespace-normalized query text (case is kept,
+# since the embedding model is case-sensitive). Vectors are stored as float32
+# arrays (4 bytes per value) instead of lists of Python floats, and a miss
+# returns the same float32-rounded values a later hit would.
+MAX_EMBEDDING_CACHE_ENTRIES = 1024
+_embedding_cache: OrderedDict[bytes, array] = OrderedDict()
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_BASE_ENDPOINT_PATTERN = re.compile(r"(https://[^/]+)")
+
+# Process-wide embeddings clients keyed by endpoint; closed by the FastAPI
+# lifespan on shutdown.
+_openai_clients: dict[str, AsyncAzureOpenAI] = {}
+
+
+def _embedding_cache_key(deployment: str, dimensions: int | None, text: str) -> bytes:
+    """Build the cache key for *text* embedded with *deployment* at *dimensions*."""
+    normalized = _WHITESPACE_PATTERN.sub(" ", text.strip())
+    return hashlib.sha256(f"{deployment}\n{dimensions}\n{normalized}".encode()).digest()
+
+
+def _get_openai_client(endpoint: str) -> AsyncAzureOpenAI:
+    """Return the process-wide embeddings client for *endpoint*.
+
+    The client keeps its HTTP connection pool across requests and refreshes
+    its AAD token through the shared credential only when it nears expiry.
+    """
+    client = _openai_clients.get(endpoint)
+    if client is None:
+        client = AsyncAzureOpenAI(
+            azure_endpoint=endpoint,
+            azure_ad_token_provider=get_bearer_token_provider(
+                get_shared_credential(), "https://cognitiveservices.azure.com/.default"
+            ),
+            api_version="2024-06-01",
+        )
+        _openai_clients[endpoint] = client
+    return client
+
+
+async def close_openai_clients() -> None:
+    """Close every shared embeddings client.
+
+    Call this from application shutdown only.
+    """
+    clients = list(_openai_clients.values())
+    _openai_clients.clear()
+    for client in clients:
+        await client.close()
+
 
 class AzureSearchClient:
     """
@@ -42,35 +97,29 @@ class AzureSearchClient:
             index_name: Name of the Azure AI Search index to query
             vector_field: Name of the vector field in the index
         """
+        # A client is built for every search, so read the process-wide
+        # settings object rather than the environment on each construction.
+        settings = get_settings()
         self.index_name = index_name
-        self.endpoint = os.getenv("AZURE_SEARCH_ENDPOINT", "")
+        self.endpoint = settings.azure_search_endpoint
         self.vector_field = vector_field
-        self._credential: DefaultAzureCredential | None = None
         self._search_client: SearchClient | None = None
-        self._openai_client: AsyncAzureOpenAI | None = None
 
         # Parse AI project endpoint for embeddings
-        project_endpoint = os.getenv("AZURE_AI_PROJECT_ENDPOINT", "")
-        match = re.match(r"(https://[^/]+)", project_endpoint)
+        match = _BASE_ENDPOINT_PATTERN.match(settings.azure_ai_project_endpoint)
         self._ai_base_endpoint = match.group(1) if match else ""
-        self._embedding_deployment = os.getenv("AZURE_AI_EMBEDDING_DEPLOYMENT", "embedding-small")
+        self._embedding_deployment = settings.azure_ai_embedding_deployment
+        self._embedding_dimensions = settings.azure_ai_embedding_dimensions
 
     async def __aenter__(self) -> Self:
-        """Set up the search client and credentials."""
+        """Set up the search client with the shared credential."""
         if not self.endpoint:
             raise ValueError("AZURE_SEARCH_ENDPOINT environment variable is required")
 
-        # Use AZURE_CLIENT_ID for user-assigned managed identity in Container Apps
-        client_id = os.getenv("AZURE_CLIENT_ID")
-        if client_id:
-            self._credential = DefaultAzureCredential(managed_identity_client_id=client_id)
-        else:
-            self._credential = DefaultAzureCredential()
-
         self._search_client = SearchClient(
             endpoint=self.endpoint,
             index_name=self.index_name,
-            credential=self._credential,
+            credential=get_shared_credential(),
         )
         return self
 
@@ -80,18 +129,17 @@ class AzureSearchClient:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        """Clean up resources."""
+        """Close the search client; the shared credential stays open."""
         if self._search_client:
             await self._search_client.close()
-        if self._openai_client:
-            await self._openai_client.close()
-        if self._credential:
-            await self._credential.close()
 
     async def get_embeddings(self, text: str) -> list[float] | None:
         """
         Generate embeddings for the given text using Azure OpenAI.
 
+        Results are cached per process, so repeated questions (retries,
+        clarifications, template-then-table lookups) skip the round-trip.
+
         Args:
             text: The text to generate embeddings for
 
@@ -102,40 +150,53 @@ class AzureSearchClient:
             logger.warning("No AI endpoint configured for embeddings")
             return None
 
+        cache_key = _embedding_cache_key(
+            self._embedding_deployment, self._embedding_dimensions, text
+        )
+        cached = _embedding_cache.get(cache_key)
+        if cached is not None:
+            _embedding_cache.move_to_end(cache_key)
+            return cached.tolist()
+
+        client = _get_openai_client(self._ai_base_endpoint)
         try:
-            if self._credential is None:
-                raise RuntimeError("Client not initialized")
-            token = await self._credential.get_token("https://cognitiveservices.azure.com/.default")
-
-            if self._openai_client is None:
-                self._openai_client = AsyncAzureOpenAI(
-                    azure_endpoint=self._ai_base_endpoint,
-                    azure_ad_token=token.token,
-                    api_version="2024-06-01",
+            if self._embedding_dimensions:
+                response = await client.embeddings.create(
+                    model=self._embedding_deployment,
+                    input=text,
+                    dimensions=self._embedding_dimensions,
+                )
+            else:
+                response = await client.embeddings.create(
+                    model=self._embedding_deployment,
+                    input=text,
                 )
-
-            response = await self._openai_client.embeddings.create(
-                model=self._embedding_deployment,
-                input=text,
-            )
-            return response.data[0].embedding
         except Exception as e:  # noqa: BLE001
             logger.warning("Failed to get embeddings: %s", e)
             return None
 
-    async def hybrid_search(
+        vector = array("f", response.data[0].embedding)
+        _embedding_cache[cache_key] = vector
+        while len(_embedding_cache) > MAX_EMBEDDING_CACHE_ENTRIES:
+            _embedding_cache.popitem(last=False)
+        return vector.tolist()
+
+    async def _search(
         self,
         query: str,
         select: list[str],
-        top: int = 5,
+        top: int,
+        *,
+        search_text: str | None,
     ) -> list[dict[str, Any]]:
         """
-        Execute hybrid (vector + keyword) search.
+        Embed the query once and issue a single search request.
 
         Args:
-            query: The search query text
+            query: The search query text to embed
             select: List of fields to return in results
             top: Maximum number of results to return
+            search_text: Keyword text for hybrid ranking, or None for pure vector search
 
         Returns:
             List of result dictionaries with selected fields and score
@@ -154,7 +215,7 @@ class AzureSearchClient:
         )
 
         results = await self._search_client.search(
-            search_text=query,
+            search_text=search_text,
             vector_queries=[vector_query],
             select=select,
             top=top,
@@ -168,6 +229,25 @@ class AzureSearchClient:
 
         return matches
 
+    async def hybrid_search(
+        self,
+        query: str,
+        select: list[str],
+        top: int = 5,
+    ) -> list[dict[str, Any]]:
+        """
+        Execute hybrid (vector + keyword) search.
+
+        Args:
+            query: The search query text
+            select: List of fields to return in results
+            top: Maximum number of results to return
+
+        Returns:
+            List of result dictionaries with selected fields and score
+        """
+        return await self._search(query, select, top, search_text=query)
+
     async def vector_search(
         self,
         query: str,
@@ -190,31 +270,25 @@ class AzureSearchClient:
             List of result dictionaries with selected fields and score.
             Scores are cosine similarity values (0.0 to 1.0 range).
         """
-        if self._search_client is None:
-            raise RuntimeError("Client not initialized")
+        # @search.score for pure vector search is cosine similarity (0-1 range)
+        return await self._search(query, select, top, search_text=None)
 
-        embeddings = await self.get_embeddings(query)
-        if embeddings is None:
-            raise RuntimeError("Failed to generate embeddings")
 
-        vector_query = VectorizedQuery(
-            vector=embeddings,
-            k_nearest_neighbors=top,
-            fields=self.vector_field,
-        )
-
-        results = await self._search_client.search(
-            search_text=None,
-            vector_queries=[vector_query],
-            select=select,
-            top=top,
-        )
+async def warm_up_search(index_names: tuple[str, ...] = ("query_templates", "tables")) -> None:
+    """Pay the search path's cold-start costs before the first user request.
 
-        matches = []
-        async for result in results:
-            match = {field: result.get(field, "") for field in select}
-            # @search.score for pure vector search is cosine similarity (0-1 range)
-            match["score"] = result.get("@search.score", 0)
-            matches.append(match)
+    Acquires the shared credential's first token, opens the embeddings and
+    search connections, and issues a ``top=1`` vector query per index.
+    Failures are logged and swallowed; a cold request still works.
 
-        return matches
+    Args:
+        index_names: Indexes to touch with a single-result query.
+    """
+    try:
+        for index_name in index_names:
+            async with AzureSearchClient(index_name=index_name) as client:
+                await client.vector_search(query="warm up", select=["id"], top=1)
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Search warm-up failed: %s", e)
+    else:
+        logger.info("Search clients warmed up (%s)", ", ".join(index_names))
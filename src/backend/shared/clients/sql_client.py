@@ -2,45 +2,275 @@
 Shared Azure SQL Database client for executing queries.
 
 This module provides a reusable async client for executing SQL queries
-against Azure SQL Database using Azure AD authentication.
+against Azure SQL Database using Azure AD authentication.  Connections are
+drawn from process-wide pools rather than opened per query.
 """
 
+import asyncio
+import hashlib
 import logging
 import os
+import re
 import struct
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from types import TracebackType
 from typing import Any, ClassVar, Self
 
 import aioodbc
-from azure.identity import DefaultAzureCredential
+from azure.core.credentials import AccessToken
+from config.settings import get_settings
 
-logger = logging.getLogger(__name__)
+from .credential import get_shared_credential
 
+logger = logging.getLogger(__name__)
 
-def get_azure_sql_token() -> bytes:
+SQL_COPT_SS_ACCESS_TOKEN = 1256
+_SELECT_PREFIX = re.compile(r"\s*SELECT", re.IGNORECASE)
+SQL_AUTH_SCOPE = "https://database.windows.net/.default"
+
+# Refresh the cached SQL access token (and replace pools logged in with it)
+# this long before it expires.
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+_sql_token: AccessToken | None = None
+_sql_token_lock = asyncio.Lock()
+
+# Process-wide connection pools keyed by (server, database) -> (pool, token
+# expires_on).  A pool logs new connections in with the access token it was
+# created with; the token is only checked at login, so open connections
+# outlive it but new ones would not.  Pools are therefore replaced when their
+# token nears expiry, and idle connections are recycled so none sits past
+# the gateway timeout.
+SQL_POOL_RECYCLE_SECONDS = 5 * 60
+_pools: dict[tuple[str, str], tuple[aioodbc.Pool, int]] = {}
+_pools_lock = asyncio.Lock()
+
+# aioodbc runs every blocking pyodbc call in an executor.  Give each
+# (server, database) its own thread pool, sized to its connection pool, so
+# queries neither queue behind nor starve the event loop's default executor
+# that FastAPI and other libraries also use, nor queue behind another
+# database's queries.  An executor outlives the pools replaced under its key,
+# so threads in use are bounded by pools x azure_sql_pool_max_size.
+_sql_executors: dict[tuple[str, str], ThreadPoolExecutor] = {}
+
+# Rows pulled from the driver per fetchmany() call.
+FETCH_BATCH_SIZE = 256
+
+# Short-lived cache of successful read-only results, keyed by a digest of
+# (server, database, row cap, SQL text, parameters) -> (result, stored_at).
+# Repeated questions, refinements and replays re-run identical SQL within
+# seconds; results with time-dependent functions are never cached, and large
+# results are skipped to bound memory.
+MAX_RESULT_CACHE_ENTRIES = 128
+RESULT_CACHE_MAX_ROWS = 1000
+_result_cache: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()
+_VOLATILE_SQL_PATTERN = re.compile(
+    r"\b(?:GETDATE|GETUTCDATE|SYSDATETIME|SYSUTCDATETIME|SYSDATETIMEOFFSET"
+    r"|CURRENT_TIMESTAMP|NEWID|RAND)\b",
+    re.IGNORECASE,
+)
+
+
+def _is_fresh(expires_on: int) -> bool:
+    """Whether a token expiring at *expires_on* is outside the refresh margin."""
+    return expires_on - TOKEN_REFRESH_MARGIN_SECONDS > time.time()
+
+
+async def get_azure_sql_token() -> AccessToken:
     """
     Get an Azure AD token for SQL Database authentication.
 
+    The token comes from the process-wide shared credential and is cached
+    until it is within ``TOKEN_REFRESH_MARGIN_SECONDS`` of expiry, so the
+    credential chain (an ``az`` subprocess locally) runs once per token
+    lifetime rather than once per connection.
+
     Returns:
-        Token bytes formatted for pyodbc
+        The cached or freshly acquired access token.
     """
-    # Use AZURE_CLIENT_ID for user-assigned managed identity in Container Apps
-    # When running locally, DefaultAzureCredential will use CLI/VS Code credentials
-    client_id = os.getenv("AZURE_CLIENT_ID")
-    logger.info("Getting SQL token, AZURE_CLIENT_ID=%s", client_id)
+    global _sql_token
+    token = _sql_token
+    if token is not None and _is_fresh(token.expires_on):
+        return token
+
+    async with _sql_token_lock:
+        token = _sql_token
+        if token is None or not _is_fresh(token.expires_on):
+            token = await get_shared_credential().get_token(SQL_AUTH_SCOPE)
+            _sql_token = token
+            logger.info("SQL token acquired, expires_on=%s", token.expires_on)
+    return token
+
+
+def _token_struct(token: str) -> bytes:
+    """Format an access token for the SQL Server ODBC driver."""
+    token_bytes = token.encode("utf-16-le")
+    return struct.pack(f"<I{len(token_bytes)}s", len(token_bytes), token_bytes)
 
-    if client_id:
-        credential = DefaultAzureCredential(managed_identity_client_id=client_id)
-    else:
-        credential = DefaultAzureCredential()
 
-    token = credential.get_token("https://database.windows.net/.default")
-    logger.info("Token acquired, expires_on=%s", token.expires_on)
+# Types pyodbc returns that are already JSON-safe.  The driver yields exact
+# built-in types, never subclasses, so an identity lookup on type() suffices.
+_JSON_PRIMITIVES: frozenset[type] = frozenset({int, float, str, bool})
 
-    # Format token for SQL Server ODBC driver
-    token_bytes = token.token.encode("utf-16-le")
-    return struct.pack(f"<I{len(token_bytes)}s", len(token_bytes), token_bytes)
+
+def _to_json_value(value: Any) -> Any:  # noqa: ANN401
+    """Convert a value of unknown type to a JSON-safe value."""
+    if value is None or type(value) in _JSON_PRIMITIVES:
+        return value
+    if isinstance(value, Decimal):
+        # Preserve numeric type for frontend formatters
+        return float(value)
+    return str(value)
+
+
+def _decimal_to_float(value: Decimal | None) -> float | None:
+    return None if value is None else float(value)
+
+
+def _to_str(value: object) -> str | None:
+    return None if value is None else str(value)
+
+
+def _column_converter(type_code: object) -> Callable[[Any], Any] | None:
+    """Pick the JSON conversion for a column from its PEP 249 ``type_code``.
+
+    pyodbc reports the Python type it returns for the column, so every
+    non-null value in that column has that type.  ``None`` means values are
+    already JSON-safe and are used as-is.
+    """
+    if type_code in _JSON_PRIMITIVES:
+        return None
+    if type_code is Decimal:
+        return _decimal_to_float
+    if isinstance(type_code, type):
+        return _to_str
+    return _to_json_value
+
+
+def _result_cache_key(
+    server: str,
+    database: str,
+    max_rows: int,
+    query: str,
+    params: list[Any] | None,
+    *,
+    columnar: bool,
+) -> bytes | None:
+    """Return the result-cache key for a query, or ``None`` if it must not be cached."""
+    if get_settings().azure_sql_result_cache_ttl_seconds <= 0:
+        return None
+    if not _SELECT_PREFIX.match(query) or _VOLATILE_SQL_PATTERN.search(query):
+        return None
+    raw = f"{server}\n{database}\n{max_rows}\n{columnar}\n{query.strip()}\n{params!r}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+
+def _get_cached_result(key: bytes) -> dict[str, Any] | None:
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+    result, stored_at = entry
+    if time.monotonic() - stored_at >= get_settings().azure_sql_result_cache_ttl_seconds:
+        del _result_cache[key]
+        return None
+    _result_cache.move_to_end(key)
+    return _copy_result(result)
+
+
+def _copy_result(result: dict[str, Any]) -> dict[str, Any]:
+    """Copy a result so callers can't mutate the cached row or column lists."""
+    if "data" in result:
+        return {**result, "data": [list(values) for values in result["data"]]}
+    return {**result, "rows": list(result["rows"])}
+
+
+def _cache_result(key: bytes, result: dict[str, Any]) -> None:
+    if result["truncated"] or result["row_count"] > RESULT_CACHE_MAX_ROWS:
+        return
+    _result_cache[key] = (result, time.monotonic())
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > MAX_RESULT_CACHE_ENTRIES:
+        _result_cache.popitem(last=False)
+
+
+def _get_sql_executor(server: str, database: str) -> ThreadPoolExecutor:
+    key = (server, database)
+    executor = _sql_executors.get(key)
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=get_settings().azure_sql_pool_max_size,
+            thread_name_prefix="azure-sql",
+        )
+        _sql_executors[key] = executor
+    return executor
+
+
+async def _retire_pool(pool: aioodbc.Pool) -> None:
+    """Stop handing out *pool*'s connections; in-use ones close on release."""
+    pool.close()
+    await pool.clear()
+
+
+async def get_sql_pool(server: str, database: str) -> aioodbc.Pool:
+    """Return the shared connection pool for *server*/*database*.
+
+    The pool is created on first use and replaced once its access token
+    nears expiry, so new logins always carry a valid token.
+
+    Args:
+        server: Azure SQL server hostname.
+        database: Database name.
+
+    Returns:
+        An open ``aioodbc.Pool``.
+    """
+    key = (server, database)
+    entry = _pools.get(key)
+    if entry is not None and _is_fresh(entry[1]):
+        return entry[0]
+
+    async with _pools_lock:
+        entry = _pools.get(key)
+        if entry is not None and _is_fresh(entry[1]):
+            return entry[0]
+
+        token = await get_azure_sql_token()
+        connection_string = (
+            f"DRIVER={{ODBC Driver 18 for SQL Server}};SERVER={server};DATABASE={database};"
+        )
+        pool = await aioodbc.create_pool(
+            dsn=connection_string,
+            minsize=0,
+            maxsize=get_settings().azure_sql_pool_max_size,
+            pool_recycle=SQL_POOL_RECYCLE_SECONDS,
+            autocommit=True,
+            executor=_get_sql_executor(server, database),
+            attrs_before={SQL_COPT_SS_ACCESS_TOKEN: _token_struct(token.token)},
+        )
+        _pools[key] = (pool, token.expires_on)
+
+    if entry is not None:
+        await _retire_pool(entry[0])
+    return pool
+
+
+async def close_sql_pools() -> None:
+    """Close every shared connection pool.
+
+    Call this from application shutdown only.
+    """
+    pools = [pool for pool, _ in _pools.values()]
+    _pools.clear()
+    for pool in pools:
+        pool.close()
+        await pool.wait_closed()
+    executors = list(_sql_executors.values())
+    _sql_executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False)
 
 
 class AzureSqlClient:
@@ -66,9 +296,22 @@ class AzureSqlClient:
         "EXEC",
         "EXECUTE",
     ]
+    # One case-insensitive pass instead of upper-casing the query and scanning
+    # it once per keyword.  Longest first so the reported keyword is the full
+    # word (EXECUTE, not EXEC).
+    _FORBIDDEN_PATTERN: ClassVar[re.Pattern[str]] = re.compile(
+        "|".join(map(re.escape, sorted(DANGEROUS_KEYWORDS, key=len, reverse=True))),
+        re.IGNORECASE,
+    )
 
     def __init__(
-        self, server: str | None = None, database: str | None = None, *, read_only: bool = True
+        self,
+        server: str | None = None,
+        database: str | None = None,
+        *,
+        read_only: bool = True,
+        max_rows: int | None = None,
+        columnar: bool = False,
     ) -> None:
         """
         Initialize the SQL client.
@@ -77,31 +320,27 @@ class AzureSqlClient:
             server: Azure SQL server hostname. Defaults to AZURE_SQL_SERVER env var.
             database: Database name. Defaults to AZURE_SQL_DATABASE env var or 'WideWorldImporters'.
             read_only: If True, only SELECT queries are allowed.
+            max_rows: Maximum rows fetched per query. Defaults to AZURE_SQL_MAX_ROWS.
+            columnar: If True, results carry ``data`` (one value list per
+                column) instead of ``rows`` (one dict per row), which avoids
+                repeating every column name in every row.
         """
         self.server = server or os.getenv("AZURE_SQL_SERVER", "")
         self.database = database or os.getenv("AZURE_SQL_DATABASE", "WideWorldImporters")
         self.read_only = read_only
+        self.max_rows = max_rows if max_rows is not None else get_settings().azure_sql_max_rows
+        self.columnar = columnar
+        self._pool: aioodbc.Pool | None = None
         self._connection: aioodbc.Connection | None = None
+        self._discard_connection = False
 
     async def __aenter__(self) -> Self:
-        """Establish the database connection."""
+        """Acquire a connection from the shared pool."""
         if not self.server:
             raise ValueError("AZURE_SQL_SERVER environment variable is required")
 
-        connection_string = (
-            f"DRIVER={{ODBC Driver 18 for SQL Server}};"
-            f"SERVER={self.server};"
-            f"DATABASE={self.database};"
-        )
-
-        token_struct = get_azure_sql_token()
-
-        self._connection = await aioodbc.connect(
-            dsn=connection_string,
-            attrs_before={
-                1256: token_struct  # SQL_COPT_SS_ACCESS_TOKEN
-            },
-        )
+        self._pool = await get_sql_pool(self.server, self.database)
+        self._connection = await self._pool.acquire()
         return self
 
     async def __aexit__(
@@ -110,9 +349,27 @@ class AzureSqlClient:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        """Close the database connection."""
-        if self._connection:
+        """Return the connection to the pool, closing it first if it failed."""
+        if self._pool is None or self._connection is None:
+            return
+        if self._discard_connection or exc_type is not None:
             await self._connection.close()
+            await self._pool.release(self._connection)
+            # Workaround for aioodbc 0.5.0: Pool.release() only calls _wakeup()
+            # for connections that are still open, so a task blocked in
+            # acquire() at maxsize never learns a slot freed up.  Remove once
+            # upstream wakes waiters when a closed connection is released.
+            wakeup = getattr(self._pool, "_wakeup", None)
+            if wakeup is not None:
+                await wakeup()
+        else:
+            await self._pool.release(self._connection)
+        self._connection = None
+
+    @property
+    def connection_discarded(self) -> bool:
+        """Whether a failed query marked the connection unfit for further use."""
+        return self._discard_connection
 
     def validate_query(self, query: str) -> tuple[bool, str | None]:
         """
@@ -124,21 +381,81 @@ class AzureSqlClient:
         Returns:
             Tuple of (is_valid, error_message). error_message is None if valid.
         """
-        query_upper = query.strip().upper()
+        if not self.read_only:
+            return True, None
 
-        if self.read_only and not query_upper.startswith("SELECT"):
+        if not _SELECT_PREFIX.match(query):
             return False, "Only SELECT queries are allowed. Query must start with SELECT."
 
-        if self.read_only:
-            for keyword in self.DANGEROUS_KEYWORDS:
-                if keyword in query_upper:
-                    return (
-                        False,
-                        f"Query contains forbidden keyword: {keyword}. Only read-only SELECT queries are allowed.",
-                    )
+        forbidden = self._FORBIDDEN_PATTERN.search(query)
+        if forbidden:
+            return (
+                False,
+                f"Query contains forbidden keyword: {forbidden.group().upper()}. "
+                "Only read-only SELECT queries are allowed.",
+            )
 
         return True, None
 
+    async def _fetch_rows(
+        self, cursor: aioodbc.Cursor, columns: list[str]
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """Fetch up to ``max_rows`` rows in batches, converting each batch as it arrives.
+
+        Raw tuples are dropped batch by batch instead of materialising the
+        whole result before conversion, and fetching stops as soon as the
+        cap is exceeded.  Value conversion is chosen once per column from
+        the cursor description rather than per cell.
+
+        Returns:
+            Tuple of (JSON-safe row dicts, whether rows beyond the cap were dropped).
+        """
+        converters = [_column_converter(desc[1]) for desc in cursor.description]
+        rows: list[dict[str, Any]] = []
+        truncated = False
+        while batch := await cursor.fetchmany(FETCH_BATCH_SIZE):
+            remaining = self.max_rows - len(rows)
+            if len(batch) > remaining:
+                truncated = True
+                del batch[remaining:]
+            rows.extend(
+                {
+                    col: value if convert is None else convert(value)
+                    for col, convert, value in zip(columns, converters, row, strict=True)
+                }
+                for row in batch
+            )
+            if truncated:
+                logger.warning("Query returned more than %d rows; truncating", self.max_rows)
+                break
+        return rows, truncated
+
+    async def _fetch_columns(self, cursor: aioodbc.Cursor) -> tuple[list[list[Any]], bool]:
+        """Fetch up to ``max_rows`` rows in batches as one value list per column.
+
+        Returns:
+            Tuple of (JSON-safe column value lists, whether rows beyond the cap
+            were dropped).
+        """
+        converters = [_column_converter(desc[1]) for desc in cursor.description]
+        data: list[list[Any]] = [[] for _ in converters]
+        row_count = 0
+        truncated = False
+        while batch := await cursor.fetchmany(FETCH_BATCH_SIZE):
+            remaining = self.max_rows - row_count
+            if len(batch) > remaining:
+                truncated = True
+                del batch[remaining:]
+            row_count += len(batch)
+            # A batch trimmed to nothing at the cap transposes to no columns.
+            batch_columns = zip(*batch, strict=True)
+            for values, convert, column in zip(data, converters, batch_columns, strict=False):
+                values.extend(column if convert is None else map(convert, column))
+            if truncated:
+                logger.warning("Query returned more than %d rows; truncating", self.max_rows)
+                break
+        return data, truncated
+
     async def execute_query(self, query: str, params: list[Any] | None = None) -> dict[str, Any]:
         """
         Execute a SQL query and return results.
@@ -153,17 +470,33 @@ class AzureSqlClient:
             A dictionary containing:
             - success: Whether the query executed successfully
             - columns: List of column names in the result
-            - rows: List of dictionaries, one per row
+            - rows: List of dictionaries, one per row (``data`` when the
+              client is columnar: one list of values per column)
             - row_count: Number of rows returned
+            - truncated: Whether rows beyond ``max_rows`` were dropped
             - error: Error message if the query failed
         """
-        logger.info("Executing SQL query: %s", query[:200])
+        logger.info("Executing SQL query: %.200s", query)
 
         # Validate query
         is_valid, error = self.validate_query(query)
         if not is_valid:
             return {"success": False, "error": error, "columns": [], "rows": [], "row_count": 0}
 
+        # A writable client may change the data it reads, so only read-only
+        # clients share cached results.
+        cache_key = (
+            _result_cache_key(
+                self.server, self.database, self.max_rows, query, params, columnar=self.columnar
+            )
+            if self.read_only
+            else None
+        )
+        cached = _get_cached_result(cache_key) if cache_key else None
+        if cached is not None:
+            logger.info("Returning cached result (%d rows)", cached["row_count"])
+            return cached
+
         try:
             if not self._connection:
                 return {
@@ -186,37 +519,29 @@ class AzureSqlClient:
                     [col_desc[0] for col_desc in cursor.description] if cursor.description else []
                 )
 
-                # Fetch all rows
-                raw_rows = await cursor.fetchall()
-
-                # Convert to list of dicts with JSON-safe values
-                rows = []
-                for row in raw_rows:
-                    row_dict = {}
-                    for i, col in enumerate(columns):
-                        value = row[i]
-                        # Convert non-JSON-serializable types
-                        if value is None:
-                            row_dict[col] = None
-                        elif isinstance(value, (int, float, str, bool)):
-                            row_dict[col] = value
-                        elif isinstance(value, Decimal):
-                            # Preserve numeric type for frontend formatters
-                            row_dict[col] = float(value)
-                        else:
-                            row_dict[col] = str(value)
-                    rows.append(row_dict)
-
-                logger.info("Query executed successfully. Returned %d rows.", len(rows))
-
-                return {
-                    "success": True,
-                    "columns": columns,
-                    "rows": rows,
-                    "row_count": len(rows),
-                    "error": None,
-                }
+                if self.columnar:
+                    data, truncated = await self._fetch_columns(cursor)
+                    row_count = len(data[0]) if data else 0
+                else:
+                    data, truncated = await self._fetch_rows(cursor, columns)
+                    row_count = len(data)
 
         except Exception as e:
             logger.exception("SQL execution error")
+            # The connection may be broken; don't hand it back to the pool.
+            self._discard_connection = True
             return {"success": False, "error": str(e), "columns": [], "rows": [], "row_count": 0}
+
+        logger.info("Query executed successfully. Returned %d rows.", row_count)
+        result = {
+            "success": True,
+            "columns": columns,
+            "data" if self.columnar else "rows": data,
+            "row_count": row_count,
+            "truncated": truncated,
+            "error": None,
+        }
+        if cache_key:
+            _cache_result(cache_key, result)
+            result = _copy_result(result)
+        return result
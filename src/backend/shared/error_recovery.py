@@ -4,6 +4,8 @@ Pure functions that classify validation violations, build user-friendly error
 messages, and select contextual recovery suggestions.
 """
 
+import re
+
 from models import SchemaSuggestion
 
 # ── Error classification patterns ────────────────────────────────────────
@@ -21,6 +23,20 @@ _DATE_CONTEXT_PATTERNS = {
     "dataset-relative date context",
 }
 
+
+def _compile_phrases(phrases: set[str]) -> re.Pattern[str]:
+    """Compile phrases into one case-insensitive alternation."""
+    return re.compile("|".join(map(re.escape, sorted(phrases))), re.IGNORECASE)
+
+
+# Categories in priority order, each scanned in a single regex pass
+_VIOLATION_CATEGORIES: tuple[tuple[re.Pattern[str], str], ...] = (
+    (_compile_phrases(_DISALLOWED_TABLE_PATTERNS), "disallowed_tables"),
+    (_compile_phrases(_SYNTAX_PATTERNS), "syntax"),
+    (_compile_phrases(_UNION_PATTERNS), "union_type_safety"),
+    (_compile_phrases(_DATE_CONTEXT_PATTERNS), "date_context"),
+)
+
 # Schema area -> example recovery prompts
 _RECOVERY_SUGGESTIONS: dict[str, list[SchemaSuggestion]] = {
     "sales": [
@@ -61,19 +77,10 @@ def classify_violations(violations: list[str]) -> str:
     Returns:
         One of 'disallowed_tables', 'syntax', 'union_type_safety', 'date_context', or 'generic'.
     """
-    combined = " ".join(violations).lower()
-    for pattern in _DISALLOWED_TABLE_PATTERNS:
-        if pattern in combined:
-            return "disallowed_tables"
-    for pattern in _SYNTAX_PATTERNS:
-        if pattern in combined:
-            return "syntax"
-    for pattern in _UNION_PATTERNS:
-        if pattern in combined:
-            return "union_type_safety"
-    for pattern in _DATE_CONTEXT_PATTERNS:
-        if pattern in combined:
-            return "date_context"
+    combined = " ".join(violations)
+    for pattern, category in _VIOLATION_CATEGORIES:
+        if pattern.search(combined):
+            return category
     return "generic"
 
 
@@ -8,9 +8,12 @@ return canned data with zero network or filesystem access.
 from __future__ import annotations
 
 import asyncio
+import logging
 import time
 from typing import Any, Protocol, runtime_checkable
 
+logger = logging.getLogger(__name__)
+
 
 @runtime_checkable
 class TemplateSearchService(Protocol):
@@ -122,7 +125,8 @@ class QueueReporter:
 
     Mirrors the existing ``emit_step_start`` / ``emit_step_end`` logic
     in ``api.step_events`` so the SSE streaming endpoint can consume
-    them without any ContextVar coupling.
+    them without any ContextVar coupling.  Events are dropped, with a
+    warning, if a bounded queue is full.
 
     Args:
         queue: The asyncio queue to push step dicts onto.
@@ -130,7 +134,7 @@ class QueueReporter:
 
     def __init__(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
         self._queue = queue
-        self._start_times: dict[str, float] = {}
+        self._start_times: dict[str, int] = {}
 
     def step_start(self, step: str) -> None:
         """Record start time and enqueue a *started* event.
@@ -138,12 +142,11 @@ class QueueReporter:
         Args:
             step: Human-readable step label.
         """
-        start_time = time.time()
-        self._start_times[step] = start_time
-        self._queue.put_nowait({
+        self._start_times[step] = time.perf_counter_ns()
+        self._put({
             "step": step,
             "status": "started",
-            "start_time": start_time,
+            "start_time": time.time(),
         })
 
     def step_end(self, step: str) -> None:
@@ -152,11 +155,17 @@ class QueueReporter:
         Args:
             step: Human-readable step label (must match a prior start).
         """
-        end_time = time.time()
-        start_time = self._start_times.pop(step, None)
-        duration_ms = int((end_time - start_time) * 1000) if start_time else None
-        self._queue.put_nowait({
+        end_ns = time.perf_counter_ns()
+        start_ns = self._start_times.pop(step, None)
+        duration_ms = (end_ns - start_ns) // 1_000_000 if start_ns is not None else None
+        self._put({
             "step": step,
             "status": "completed",
             "duration_ms": duration_ms,
         })
+
+    def _put(self, event: dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Step queue full, dropping %s event: %s", event["status"], event["step"])
@@ -0,0 +1,80 @@
+"""
+Process-wide cache of validated template drafts.
+
+When a question matches a query template, the parameter extractor (often
+an LLM call) turns it into a validated ``SQLDraft``.  Asking the same
+question again against the same template yields the same draft, so the
+pipeline can skip extraction and validation and go straight to execution.
+Query results are cached separately and only briefly (see ``sql_client``).
+
+Entries are keyed by template id, normalised question text and the current
+date, so relative-date parameters ("last month") are re-extracted each day.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime
+
+from models import SQLDraft
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class TemplateDraftCache:
+    """LRU + TTL cache of successful template-path ``SQLDraft`` objects.
+
+    Args:
+        max_entries: Maximum cached drafts (least recently used evicted first).
+        ttl_seconds: Lifetime of an entry; bounds staleness of values that came
+            from the allowed-values cache.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600.0) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str, str], tuple[SQLDraft, float]] = OrderedDict()
+
+    @staticmethod
+    def _key(template_id: str, user_query: str) -> tuple[str, str, str]:
+        normalized = _WHITESPACE_PATTERN.sub(" ", user_query.strip().casefold())
+        return (template_id, normalized, datetime.now(UTC).date().isoformat())
+
+    def get(self, template_id: str, user_query: str) -> SQLDraft | None:
+        """Return the cached draft for this template and question, if fresh.
+
+        Args:
+            template_id: Id of the matched query template.
+            user_query: The user's question.
+
+        Returns:
+            The previously validated draft, or ``None`` on a miss.
+        """
+        key = self._key(template_id, user_query)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        draft, stored_at = entry
+        if time.monotonic() - stored_at >= self._ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return draft
+
+    def put(self, template_id: str, user_query: str, draft: SQLDraft) -> None:
+        """Cache a draft that passed extraction and validation.
+
+        Args:
+            template_id: Id of the matched query template.
+            user_query: The user's question.
+            draft: Validated draft, ready for execution.
+        """
+        key = self._key(template_id, user_query)
+        self._entries[key] = (draft, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached drafts."""
+        self._entries.clear()
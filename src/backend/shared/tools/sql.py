@@ -1,8 +1,8 @@
 """
 SQL execution tool for the data agent.
 
-Provides an AI-callable function for executing read-only SQL queries
-and an internal helper for parameterized execution.
+Provides AI-callable functions for executing read-only SQL queries, singly
+or in batches, and an internal helper for parameterized execution.
 """
 
 import logging
@@ -75,3 +75,49 @@ async def execute_sql(query: str) -> dict[str, Any]:
         - error: Error message if the query failed
     """
     return await execute_query_parameterized(query)
+
+
+@tool
+async def execute_sql_batch(queries: list[str]) -> list[dict[str, Any]]:
+    """
+    Execute several read-only SQL SELECT queries against the Wide World Importers database.
+
+    Use this instead of repeated ``execute_sql`` calls when several independent
+    queries are needed (for example, inspecting multiple tables).  The queries
+    run one after another on a single pooled connection, which is replaced
+    if a query fails.
+
+    Args:
+        queries: SQL SELECT queries to execute. Each must be read-only (SELECT only).
+
+    Returns:
+        One result dictionary per query, in order, each with the same keys
+        as ``execute_sql`` returns.  A failing query does not stop the rest.
+    """
+    step_name = "Executing SQL queries..."
+    emit_step_end_fn = None
+    try:
+        from api.step_events import emit_step_end, emit_step_start  # noqa: PLC0415
+
+        emit_step_start(step_name)
+        emit_step_end_fn = emit_step_end
+    except ImportError:
+        pass  # Step events not available (e.g., running outside API context)
+
+    results: list[dict[str, Any]] = []
+    try:
+        while len(results) < len(queries):
+            # A failed query discards its connection; continue on a fresh one.
+            async with AzureSqlClient(read_only=True) as client:
+                for query in queries[len(results) :]:
+                    results.append(await client.execute_query(query))
+                    if client.connection_discarded:
+                        break
+    except Exception as e:
+        logger.exception("SQL batch execution error")
+        error = {"success": False, "error": str(e), "columns": [], "rows": [], "row_count": 0}
+        return results + [dict(error) for _ in queries[len(results) :]]
+    finally:
+        if emit_step_end_fn:
+            emit_step_end_fn(step_name)
+    return results
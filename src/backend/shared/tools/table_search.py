@@ -76,7 +76,7 @@ async def search_tables(user_question: str) -> dict[str, Any]:
         - table_count: Number of tables returned
         - message: Status message explaining the result
     """
-    logger.info("Searching tables for: %s", user_question[:100])
+    logger.info("Searching tables for: %.100s", user_question)
 
     # Emit step start event for UI progress
     step_name = "Finding relevant tables"
@@ -101,7 +101,6 @@ async def search_tables(user_question: str) -> dict[str, Any]:
                 select=[
                     "id",
                     "table",
-                    "datasource",
                     "description",
                     "columns",
                 ],
@@ -134,12 +133,13 @@ async def search_tables(user_question: str) -> dict[str, Any]:
                 "message": f"No tables met the score threshold ({DEFAULT_TABLE_SCORE_THRESHOLD})",
             }
 
-        logger.info(
-            "Table search: %d tables above threshold (%.3f). Tables: %s",
-            len(matching_tables),
-            DEFAULT_TABLE_SCORE_THRESHOLD,
-            [t.table for t in matching_tables],
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Table search: %d tables above threshold (%.3f). Tables: %s",
+                len(matching_tables),
+                DEFAULT_TABLE_SCORE_THRESHOLD,
+                [t.table for t in matching_tables],
+            )
 
         finish_step()
         return {
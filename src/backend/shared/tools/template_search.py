@@ -125,7 +125,7 @@ async def search_query_templates(user_question: str) -> dict[str, Any]:
         - all_matches: All matching templates with their scores
         - message: Status message explaining the result
     """
-    logger.info("Searching query templates for: %s", user_question[:100])
+    logger.info("Searching query templates for: %.100s", user_question)
 
     # Emit step start event for UI progress
     step_name = "Understanding intent"
@@ -227,16 +227,19 @@ async def search_query_templates(user_question: str) -> dict[str, Any]:
             is_valid_match,
         )
 
+        # Serialise each template once; best_match reuses the first dump.
+        all_matches = [t.model_dump() for t in hydrated_templates]
+
         finish_step()
         return {
             "has_high_confidence_match": is_valid_match,
             "is_ambiguous": is_ambiguous,
-            "best_match": best_template.model_dump() if is_valid_match else None,
+            "best_match": all_matches[0] if is_valid_match else None,
             "confidence_score": best_template.score,
             "confidence_threshold": threshold,
             "ambiguity_gap": score_gap,
             "ambiguity_gap_threshold": DEFAULT_AMBIGUITY_GAP_THRESHOLD,
-            "all_matches": [t.model_dump() for t in hydrated_templates],
+            "all_matches": all_matches,
             "message": message,
         }
 
@@ -13,17 +13,18 @@ from __future__ import annotations
 
 import json
 import logging
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from agent_framework import Agent
 from agent_framework_azure_ai import AzureAIClient
-from azure.identity.aio import DefaultAzureCredential
 from config.settings import Settings
 from models import ParameterDefinition, QueryTemplate, TableColumn, TableMetadata
 from shared.allowed_values_provider import AllowedValuesProvider
-from shared.clients import AzureSearchClient, AzureSqlClient
+from shared.clients import AzureSearchClient, AzureSqlClient, get_shared_credential
 from shared.protocols import (
     NoOpReporter,
     ProgressReporter,
@@ -31,15 +32,36 @@ from shared.protocols import (
     TableSearchService,
     TemplateSearchService,
 )
+from shared.template_draft_cache import TemplateDraftCache
 
 logger = logging.getLogger(__name__)
 
+# Foundry agent versions resolved by earlier requests, keyed by
+# (project endpoint, agent name) -> (version, resolved_at).  With
+# ``use_latest_version`` every fresh ``AzureAIClient`` looks its agent up by
+# name on first use; pinning a recently resolved version skips that call.
+AGENT_VERSION_TTL_SECONDS = 3600.0
+_agent_versions: dict[tuple[str, str], tuple[str, float]] = {}
+
+# Shared by every request's ``PipelineClients`` so repeated template
+# questions skip parameter extraction across sessions.
+_template_draft_cache = TemplateDraftCache()
+
+# Process-wide allowed-values providers keyed by their configuration, so the
+# stale-while-revalidate cache survives across requests instead of being
+# rebuilt (and re-queried) for every ``PipelineClients``.
+_allowed_values_providers: dict[tuple[str, str, int, int], AllowedValuesProvider] = {}
+
 # ---------------------------------------------------------------------------
 # Hydration helpers (pure functions, no I/O)
 # ---------------------------------------------------------------------------
 
 _MIN_AMBIGUITY_RESULTS = 2
 
+# Questions shorter than this (after stripping) carry too little signal to
+# embed, so the adapters skip the embedding and search round-trips.
+_MIN_SEARCH_QUERY_CHARS = 3
+
 
 def _parse_parameters(params_json: str | list | None) -> list[ParameterDefinition]:
     """Parse stringified JSON into ``ParameterDefinition`` objects.
@@ -135,9 +157,14 @@ def _hydrate_table_metadata(raw: dict[str, Any]) -> TableMetadata:
 _ALLOWED_TABLES_PATH = Path(__file__).resolve().parents[1] / "config" / "allowed_tables.json"
 
 
+@lru_cache(maxsize=8)
 def load_allowed_tables(path: Path = _ALLOWED_TABLES_PATH) -> frozenset[str]:
     """Load allowed table names from a JSON config file.
 
+    The file is read once per path per process, since every
+    ``create_pipeline_clients()`` call needs it; call
+    ``load_allowed_tables.cache_clear()`` to pick up edits without restarting.
+
     Args:
         path: Filesystem path to a JSON array of table names.
 
@@ -197,7 +224,10 @@ class TemplateSearchAdapter:
             Dict with ``has_high_confidence_match``, ``is_ambiguous``,
             ``best_match``, ``confidence_score``, ``all_matches``, etc.
         """
-        logger.info("Searching query templates for: %s", user_question[:100])
+        logger.info("Searching query templates for: %.100s", user_question)
+        if len(user_question.strip()) < _MIN_SEARCH_QUERY_CHARS:
+            return self._empty_result("Question too short to search")
+
         try:
             async with AzureSearchClient(
                 index_name="query_templates",
@@ -266,15 +296,17 @@ class TemplateSearchAdapter:
             is_valid,
         )
 
+        # Serialise each template once; best_match reuses the first dump.
+        all_matches = [t.model_dump() for t in templates]
         return {
             "has_high_confidence_match": is_valid,
             "is_ambiguous": is_ambiguous,
-            "best_match": best.model_dump() if is_valid else None,
+            "best_match": all_matches[0] if is_valid else None,
             "confidence_score": top_score,
             "confidence_threshold": self._confidence_threshold,
             "ambiguity_gap": score_gap,
             "ambiguity_gap_threshold": self._ambiguity_gap,
-            "all_matches": [t.model_dump() for t in templates],
+            "all_matches": all_matches,
             "message": message,
         }
 
@@ -321,7 +353,15 @@ class TableSearchAdapter:
         Returns:
             Dict with ``has_matches``, ``tables``, ``table_count``, ``message``.
         """
-        logger.info("Searching tables for: %s", user_question[:100])
+        logger.info("Searching tables for: %.100s", user_question)
+        if len(user_question.strip()) < _MIN_SEARCH_QUERY_CHARS:
+            return {
+                "has_matches": False,
+                "tables": [],
+                "table_count": 0,
+                "message": "Question too short to search",
+            }
+
         try:
             async with AzureSearchClient(
                 index_name="tables",
@@ -329,7 +369,7 @@ class TableSearchAdapter:
             ) as client:
                 results = await client.hybrid_search(
                     query=user_question,
-                    select=["id", "table", "datasource", "description", "columns"],
+                    select=["id", "table", "description", "columns"],
                     top=5,
                 )
         except Exception as exc:
@@ -363,12 +403,13 @@ class TableSearchAdapter:
                 "message": f"No tables met the score threshold ({self._score_threshold})",
             }
 
-        logger.info(
-            "Table search: %d tables above threshold (%.3f). Tables: %s",
-            len(matching),
-            self._score_threshold,
-            [t.table for t in matching],
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Table search: %d tables above threshold (%.3f). Tables: %s",
+                len(matching),
+                self._score_threshold,
+                [t.table for t in matching],
+            )
         return {
             "has_matches": True,
             "tables": [t.model_dump() for t in matching],
@@ -381,8 +422,8 @@ class TableSearchAdapter:
 class SqlExecutorAdapter:
     """``SqlExecutor`` backed by ``AzureSqlClient``.
 
-    Each ``execute()`` call opens and closes a fresh database connection
-    (matching the existing per-call pattern in the ``@tool`` function).
+    Each ``execute()`` call borrows a connection from the shared pool for
+    the server/database and returns it when the query completes.
 
     Args:
         server: Azure SQL server hostname.
@@ -448,6 +489,8 @@ class PipelineClients:
         allowed_tables: Set of fully-qualified table names for query validation.
         allowed_values_provider: Optional provider for database-sourced allowed values.
         conversation_id: Optional provider conversation ID for multi-agent trace continuity.
+        template_draft_cache: Optional cache of validated template drafts, letting
+            repeated questions skip parameter extraction.
     """
 
     param_extractor_agent: Agent
@@ -459,6 +502,7 @@ class PipelineClients:
     allowed_tables: frozenset[str]
     allowed_values_provider: AllowedValuesProvider | None = None
     conversation_id: str | None = None
+    template_draft_cache: TemplateDraftCache | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -466,6 +510,55 @@ class PipelineClients:
 # ---------------------------------------------------------------------------
 
 
+def _get_allowed_values_provider(settings: Settings) -> AllowedValuesProvider:
+    """Return the shared ``AllowedValuesProvider`` for *settings*, creating it once."""
+    key = (
+        settings.azure_sql_server,
+        settings.azure_sql_database,
+        settings.allowed_values_ttl_seconds,
+        settings.allowed_values_max_cache_entries,
+    )
+    provider = _allowed_values_providers.get(key)
+    if provider is None:
+        provider = AllowedValuesProvider(
+            server=settings.azure_sql_server,
+            database=settings.azure_sql_database,
+            ttl_seconds=settings.allowed_values_ttl_seconds,
+            max_entries=settings.allowed_values_max_cache_entries,
+        )
+        _allowed_values_providers[key] = provider
+    return provider
+
+
+def _pin_agent_version(llm: AzureAIClient, endpoint: str, agent: Agent) -> None:
+    """Reuse a recently resolved Foundry version for *agent*, if one is cached."""
+    cached = _agent_versions.get((endpoint, agent.name or ""))
+    if cached is not None and time.monotonic() - cached[1] < AGENT_VERSION_TTL_SECONDS:
+        llm.agent_version = cached[0]
+
+
+def remember_agent_versions(clients: PipelineClients, settings: Settings) -> None:
+    """Cache the Foundry agent versions resolved while running *clients*.
+
+    Call after ``process_query()`` so the next ``create_pipeline_clients()``
+    can pin those versions instead of looking the agents up again.
+
+    Args:
+        clients: The bundle that was just used for a pipeline run.
+        settings: Settings the bundle was created from.
+    """
+    now = time.monotonic()
+    for agent in (clients.param_extractor_agent, clients.query_builder_agent):
+        version = getattr(agent.client, "agent_version", None)
+        if not isinstance(version, str):
+            continue
+        # Only a fresh lookup refreshes the entry; pinned clients echo it back.
+        key = (settings.azure_ai_project_endpoint, agent.name or "")
+        cached = _agent_versions.get(key)
+        if cached is None or now - cached[1] >= AGENT_VERSION_TTL_SECONDS:
+            _agent_versions[key] = (version, now)
+
+
 def create_pipeline_clients(
     settings: Settings,
     reporter: ProgressReporter | None = None,
@@ -475,8 +568,9 @@ def create_pipeline_clients(
 
     Loads prompts from disk, creates ``Agent`` instances via the
     updated agent factories, wraps Azure clients in Protocol adapters,
-    and reads the allowed-tables config file.  No module-level singletons
-    are created; each call produces a fresh, self-contained bundle.
+    and reads the allowed-tables config file.  The Azure credential, the
+    ``AllowedValuesProvider`` and the allowed-tables set are process-wide
+    shared instances; everything else is created per call.
 
     Args:
         settings: Centralised application configuration.
@@ -488,11 +582,7 @@ def create_pipeline_clients(
         Fully-initialised ``PipelineClients`` ready for ``process_query()``.
     """
     # -- Credential --------------------------------------------------------
-    credential = (
-        DefaultAzureCredential(managed_identity_client_id=settings.azure_client_id)
-        if settings.azure_client_id
-        else DefaultAzureCredential()
-    )
+    credential = get_shared_credential()
 
     # -- LLM clients -------------------------------------------------------
     extractor_model = (
@@ -517,7 +607,7 @@ def create_pipeline_clients(
         extractor_llm.conversation_id = conversation_id
         builder_llm.conversation_id = conversation_id
 
-    # -- Prompts (loaded once from disk) -----------------------------------
+    # -- Prompts (read from disk once per process) -----------------------------
     from parameter_extractor.agent import (  # noqa: PLC0415
         create_param_extractor_agent,
     )
@@ -537,6 +627,8 @@ def create_pipeline_clients(
     # -- Agents ------------------------------------------------------------
     param_agent = create_param_extractor_agent(extractor_llm, extractor_prompt)
     builder_agent = create_query_builder_agent(builder_llm, builder_prompt)
+    _pin_agent_version(extractor_llm, settings.azure_ai_project_endpoint, param_agent)
+    _pin_agent_version(builder_llm, settings.azure_ai_project_endpoint, builder_agent)
 
     # -- Protocol adapters -------------------------------------------------
     template_search = TemplateSearchAdapter(
@@ -555,12 +647,7 @@ def create_pipeline_clients(
     allowed_tables = load_allowed_tables()
 
     # -- AllowedValuesProvider ---------------------------------------------
-    avp = AllowedValuesProvider(
-        server=settings.azure_sql_server,
-        database=settings.azure_sql_database,
-        ttl_seconds=settings.allowed_values_ttl_seconds,
-        max_entries=settings.allowed_values_max_cache_entries,
-    )
+    avp = _get_allowed_values_provider(settings)
 
     return PipelineClients(
         param_extractor_agent=param_agent,
@@ -572,4 +659,5 @@ def create_pipeline_clients(
         allowed_tables=allowed_tables,
         allowed_values_provider=avp,
         conversation_id=conversation_id,
+        template_draft_cache=_template_draft_cache,
     )
@@ -40,7 +40,7 @@ def _make_mock_client(
     mock_client.execute_query.return_value = {
         "success": success,
         "columns": [column],
-        "rows": rows,
+        "data": [[row.get(column) for row in rows]],
         "row_count": len(rows),
         "error": error,
     }
@@ -141,6 +141,8 @@ class TestAllowedValuesProviderCore:
 
             # Second call should return stale data + kick off bg task
             second = await provider.get_allowed_values("Sales.Items", "Col")
+            # Let the refresh finish while the client is still patched
+            await asyncio.gather(*provider._background_tasks)
 
         assert second is not None
         assert second.values == ["Stale"]
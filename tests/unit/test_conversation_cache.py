@@ -0,0 +1,63 @@
+"""Tests for the conversation cache behind ``verify_conversation_ownership``."""
+
+from __future__ import annotations
+
+import sys
+import types
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Prevent ``api.__init__`` from importing ``api.main`` (which pulls in auth
+# middleware and triggers a pydantic deprecation error).
+if "api" not in sys.modules:
+    _api_stub = types.ModuleType("api")
+    _api_stub.__path__ = [str(Path(__file__).resolve().parents[2] / "src" / "backend" / "api")]  # type: ignore[attr-defined]
+    _api_stub.__package__ = "api"
+    sys.modules["api"] = _api_stub
+
+from api import dependencies
+from api.dependencies import invalidate_conversation, verify_conversation_ownership
+
+
+@pytest.fixture
+def project_client() -> MagicMock:
+    dependencies._conversation_cache.clear()
+    client = MagicMock()
+    conversations = client.get_openai_client.return_value.conversations
+    conversations.retrieve.return_value = MagicMock(metadata={"title": "Sales"})
+    yield client
+    dependencies._conversation_cache.clear()
+
+
+def _retrieve(project_client: MagicMock) -> MagicMock:
+    return project_client.get_openai_client.return_value.conversations.retrieve
+
+
+class TestConversationCache:
+    """Repeated access to a conversation skips the Foundry round trip."""
+
+    async def test_second_request_is_served_from_cache(self, project_client):
+        first = await verify_conversation_ownership("conv-1", "user-1", project_client)
+        second = await verify_conversation_ownership("conv-1", "user-1", project_client)
+
+        _retrieve(project_client).assert_called_once_with("conv-1")
+        assert second["metadata"] == first["metadata"] == {"title": "Sales"}
+
+    async def test_invalidate_forces_refetch(self, project_client):
+        await verify_conversation_ownership("conv-1", "user-1", project_client)
+        invalidate_conversation("conv-1")
+        await verify_conversation_ownership("conv-1", "user-1", project_client)
+
+        assert _retrieve(project_client).call_count == 2
+
+    async def test_expired_entry_is_refetched(self, project_client, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr(dependencies.time, "monotonic", lambda: now)
+        await verify_conversation_ownership("conv-1", "user-1", project_client)
+
+        now += dependencies.CONVERSATION_CACHE_TTL_SECONDS
+        await verify_conversation_ownership("conv-1", "user-1", project_client)
+
+        assert _retrieve(project_client).call_count == 2
@@ -0,0 +1,49 @@
+"""Tests for the process-wide shared Azure credential."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from shared.clients import credential
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_credential():
+    credential._shared_credential = None
+    yield
+    credential._shared_credential = None
+
+
+class TestSharedCredential:
+    """``get_shared_credential`` builds one credential per process."""
+
+    @patch("shared.clients.credential.DefaultAzureCredential")
+    @patch("shared.clients.credential.get_settings")
+    def test_created_once(self, mock_get_settings, mock_cred_cls):
+        mock_get_settings.return_value = MagicMock(azure_client_id=None)
+
+        first = credential.get_shared_credential()
+        second = credential.get_shared_credential()
+
+        assert first is second
+        mock_cred_cls.assert_called_once_with()
+
+    @patch("shared.clients.credential.DefaultAzureCredential")
+    @patch("shared.clients.credential.get_settings")
+    def test_uses_managed_identity_when_client_id_set(self, mock_get_settings, mock_cred_cls):
+        mock_get_settings.return_value = MagicMock(azure_client_id="my-client-id")
+
+        credential.get_shared_credential()
+
+        mock_cred_cls.assert_called_once_with(managed_identity_client_id="my-client-id")
+
+    async def test_close_releases_instance(self):
+        shared = AsyncMock()
+        credential._shared_credential = shared
+
+        await credential.close_shared_credential()
+        await credential.close_shared_credential()
+
+        shared.close.assert_awaited_once()
+        assert credential._shared_credential is None
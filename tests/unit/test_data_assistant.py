@@ -122,6 +122,18 @@ class TestClassifyIntent:
         assert result.intent == "data_query"
         assert result.query == "Show top customers"
 
+    async def test_json_followed_by_trailing_braces(self) -> None:
+        response = (
+            '```json\n{"intent": "data_query", "query": "Show orders"}\n```\n'
+            "Note: no {placeholders} were needed."
+        )
+        assistant = _make_assistant(response)
+
+        result = await assistant.classify_intent("Show orders")
+
+        assert result.intent == "data_query"
+        assert result.query == "Show orders"
+
     async def test_context_included_for_template_refinement(self) -> None:
         assistant = _make_assistant('{"intent": "refinement", "query": "change city"}')
         assistant.context.query_source = "template"
@@ -529,6 +541,17 @@ class TestRenderResponse:
 
         assert "Using default:" in rendered["text"]
 
+    def test_markdown_table_rows(self) -> None:
+        assistant = _make_assistant()
+        response = _make_response(
+            sql_response=[{"OrderID": 1, "City": "Seattle"}, {"OrderID": 2}],
+            row_count=2,
+        )
+
+        rendered = assistant.render_response(response)
+
+        assert "| OrderID | City |\n| --- | --- |\n| 1 | Seattle |\n| 2 |  |\n" in rendered["text"]
+
 
 # ── _build_suggestions ───────────────────────────────────────────────────
 
@@ -856,6 +879,13 @@ class TestScenarioIntentClassification:
 
         assert result.scenario_type == "supplier_cost_delta"
 
+    def test_infer_scenario_type_keeps_keyword_priority(self) -> None:
+        # "Reorder" matches both the demand ("order") and inventory keywords;
+        # demand is checked first.
+        assert DataAssistant._infer_scenario_type(["Reorder Point"]) == "demand_delta"
+        assert DataAssistant._infer_scenario_type(["Stock", "Supplier"]) == "supplier_cost_delta"
+        assert DataAssistant._infer_scenario_type(["raise prices"]) == "price_delta"
+
 
 # ── Non-scenario regression routing (T013) ───────────────────────────────
 
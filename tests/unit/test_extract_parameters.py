@@ -8,6 +8,7 @@ and confidence scoring.
 
 from __future__ import annotations
 
+import asyncio
 import json
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
@@ -764,6 +765,55 @@ class TestAllowedValuesHydration:
         assert result.status == "success"
         assert "category" in result.partial_cache_params
 
+    async def test_loads_database_columns_concurrently(self) -> None:
+        """Each database-sourced column is requested without waiting on the others."""
+        template = _make_template(
+            parameters=[
+                _make_param(
+                    "category",
+                    allowed_values_source="database",
+                    table="Sales.CustomerCategories",
+                    column="CategoryName",
+                ),
+                _make_param(
+                    "city",
+                    allowed_values_source="database",
+                    table="Application.Cities",
+                    column="CityName",
+                ),
+            ],
+        )
+        request = _make_request("Show Supermarket data in Seattle", template)
+
+        started = 0
+        both_started = asyncio.Event()
+
+        async def _get_allowed_values(table: str, column: str) -> MagicMock:
+            nonlocal started
+            started += 1
+            if started == 2:
+                both_started.set()
+            # Blocks forever if the loads are issued one after another.
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            values = ["Supermarket"] if column == "CategoryName" else ["Seattle"]
+            return MagicMock(values=values, is_partial=False)
+
+        provider = AsyncMock()
+        provider.get_allowed_values = AsyncMock(side_effect=_get_allowed_values)
+
+        await extract_parameters(
+            request,
+            _mock_agent(""),
+            _mock_thread(),
+            allowed_values_provider=provider,
+        )
+
+        category, city = template.parameters
+        assert category.validation is not None
+        assert category.validation.allowed_values == ["Supermarket"]
+        assert city.validation is not None
+        assert city.validation.allowed_values == ["Seattle"]
+
     async def test_no_provider_skips_hydration(self) -> None:
         """Without provider, database-sourced params are not hydrated."""
         param = _make_param(
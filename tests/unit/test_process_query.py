@@ -8,6 +8,7 @@ specific routing branches.
 
 from __future__ import annotations
 
+import dataclasses
 import json
 import math
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -33,6 +34,7 @@ from shared.scenario_math import aggregate_baseline, compute_scenario_metrics
 from shared.scenario_narrative import (
     build_narrative_summary,
 )
+from shared.template_draft_cache import TemplateDraftCache
 from workflow.clients import PipelineClients
 
 _MOD = "nl2sql_controller.pipeline"
@@ -190,6 +192,39 @@ async def test_template_path_returns_response_with_rows(
     mock_extract.assert_awaited_once()
 
 
+@patch(f"{_MOD}.AgentSession")
+@patch(f"{_MOD}.validate_query")
+@patch(f"{_MOD}.validate_parameters")
+@patch(f"{_MOD}.extract_parameters", new_callable=AsyncMock)
+async def test_template_path_reuses_cached_draft_for_repeat_question(
+    mock_extract: AsyncMock,
+    mock_val_params: MagicMock,
+    mock_val_query: MagicMock,
+    _mock_thread: MagicMock,
+) -> None:
+    """A repeated question skips extraction but still executes the SQL."""
+    draft = _success_draft()
+    mock_extract.return_value = draft
+    mock_val_params.return_value = draft
+    mock_val_query.return_value = draft
+
+    clients = _make_clients(
+        template_results=[_TEMPLATE_DICT],
+        sql_rows=_ROWS,
+        sql_columns=_COLS,
+    )
+    clients = dataclasses.replace(clients, template_draft_cache=TemplateDraftCache())
+
+    first = await process_query(NL2SQLRequest(user_query="Show orders from Seattle"), clients)
+    second = await process_query(NL2SQLRequest(user_query="show orders from seattle"), clients)
+
+    assert isinstance(first, NL2SQLResponse)
+    assert isinstance(second, NL2SQLResponse)
+    assert second.sql_query == first.sql_query == _SQL
+    assert second.row_count == 2
+    mock_extract.assert_awaited_once()
+
+
 # ── 2. Dynamic Query Path ────────────────────────────────────────────────
 
 
@@ -580,6 +615,41 @@ async def test_dynamic_refinement_reuses_previous_tables(
     assert not ts.calls  # type: ignore[union-attr]
 
 
+@patch(f"{_MOD}.AgentSession")
+@patch(f"{_MOD}.validate_query")
+@patch(f"{_MOD}.build_query", new_callable=AsyncMock)
+async def test_dynamic_refinement_searches_when_previous_tables_malformed(
+    mock_build: AsyncMock,
+    mock_val_query: MagicMock,
+    _mock_thread: MagicMock,
+) -> None:
+    """Unparseable previous_tables_json falls back to a fresh table search."""
+    draft = _success_draft(
+        source="dynamic",
+        template_id=None,
+        confidence=0.9,
+        tables_used=["Sales.Orders"],
+    )
+    mock_build.return_value = draft
+    mock_val_query.return_value = draft
+
+    request = NL2SQLRequest(
+        user_query="Sort by OrderID descending",
+        is_refinement=True,
+        previous_sql=_SQL,
+        previous_question="Show orders from Seattle",
+        previous_tables_json="[{not json",
+    )
+
+    clients = _make_clients(table_results=[_TABLE_DICT], sql_rows=_ROWS, sql_columns=_COLS)
+
+    result = await process_query(request, clients)
+
+    assert isinstance(result, NL2SQLResponse)
+    assert result.error is None
+    assert clients.table_search.calls == ["Sort by OrderID descending"]  # type: ignore[union-attr]
+
+
 @patch(f"{_MOD}.build_query", new_callable=AsyncMock)
 @patch(f"{_MOD}.validate_query")
 async def test_dynamic_confirmation_acceptance_executes_previous_sql_directly(
@@ -0,0 +1,191 @@
+"""Tests for ``AzureSearchClient`` embedding behaviour.
+
+The OpenAI client and credential are replaced with mocks so no network
+or Azure credentials are needed.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from shared.clients import search_client
+from shared.clients.search_client import AzureSearchClient
+
+
+@pytest.fixture(autouse=True)
+def _clear_embedding_cache():
+    search_client._embedding_cache.clear()
+    yield
+    search_client._embedding_cache.clear()
+
+
+@pytest.fixture
+def fake_openai(monkeypatch) -> MagicMock:
+    openai_client = MagicMock()
+    monkeypatch.setattr(search_client, "_get_openai_client", lambda _endpoint: openai_client)
+    return openai_client
+
+
+def _client_with_fake_openai(
+    openai_client: MagicMock, vector: list[float]
+) -> tuple[AzureSearchClient, MagicMock]:
+    client = AzureSearchClient(index_name="query_templates")
+    client._ai_base_endpoint = "https://test.openai.azure.com"
+    openai_client.embeddings.create = AsyncMock(
+        return_value=MagicMock(data=[MagicMock(embedding=vector)]),
+    )
+    return client, openai_client
+
+
+class TestEmbeddingCache:
+    """Repeated questions reuse the cached embedding."""
+
+    async def test_second_call_is_served_from_cache(self, fake_openai):
+        client, openai_client = _client_with_fake_openai(fake_openai, [0.5, 0.25, -1.0])
+
+        first = await client.get_embeddings("Top customers by revenue")
+        second = await client.get_embeddings("Top customers by revenue")
+
+        assert first == second == [0.5, 0.25, -1.0]
+        openai_client.embeddings.create.assert_awaited_once()
+
+    async def test_hit_returns_same_values_as_miss(self, fake_openai):
+        client, _ = _client_with_fake_openai(fake_openai, [0.1, -0.3])
+
+        first = await client.get_embeddings("Top customers")
+        second = await client.get_embeddings("Top customers")
+
+        assert first == second
+
+    async def test_key_ignores_whitespace(self, fake_openai):
+        client, openai_client = _client_with_fake_openai(fake_openai, [1.0, 2.0])
+
+        await client.get_embeddings("Top  customers\nby revenue ")
+        await client.get_embeddings("Top customers by revenue")
+
+        openai_client.embeddings.create.assert_awaited_once()
+
+    async def test_key_is_case_sensitive(self, fake_openai):
+        client, openai_client = _client_with_fake_openai(fake_openai, [1.0, 2.0])
+
+        await client.get_embeddings("Top customers")
+        await client.get_embeddings("top customers")
+
+        assert openai_client.embeddings.create.await_count == 2
+
+    async def test_different_questions_miss(self, fake_openai):
+        client, openai_client = _client_with_fake_openai(fake_openai, [1.0])
+
+        await client.get_embeddings("Top customers")
+        await client.get_embeddings("Top suppliers")
+
+        assert openai_client.embeddings.create.await_count == 2
+
+    async def test_failed_embedding_is_not_cached(self, fake_openai):
+        client, openai_client = _client_with_fake_openai(fake_openai, [1.0])
+        openai_client.embeddings.create.side_effect = [
+            RuntimeError("boom"),
+            MagicMock(data=[MagicMock(embedding=[1.0])]),
+        ]
+
+        assert await client.get_embeddings("Top customers") is None
+        assert await client.get_embeddings("Top customers") == [1.0]
+
+    async def test_cache_evicts_oldest_entry(self, fake_openai, monkeypatch):
+        monkeypatch.setattr(search_client, "MAX_EMBEDDING_CACHE_ENTRIES", 2)
+        client, openai_client = _client_with_fake_openai(fake_openai, [1.0])
+
+        await client.get_embeddings("first")
+        await client.get_embeddings("second")
+        await client.get_embeddings("third")
+        await client.get_embeddings("first")
+
+        assert openai_client.embeddings.create.await_count == 4
+        assert len(search_client._embedding_cache) == 2
+
+
+class TestOpenAIClients:
+    """Embeddings clients are shared per endpoint and closed on shutdown."""
+
+    async def test_close_openai_clients_closes_and_forgets(self, monkeypatch):
+        created: list[MagicMock] = []
+
+        def _fake_client(**_kwargs) -> MagicMock:
+            client = MagicMock()
+            client.close = AsyncMock()
+            created.append(client)
+            return client
+
+        monkeypatch.setattr(search_client, "AsyncAzureOpenAI", _fake_client)
+        monkeypatch.setattr(search_client, "get_shared_credential", MagicMock)
+        monkeypatch.setattr(search_client, "_openai_clients", {})
+
+        first = search_client._get_openai_client("https://a.openai.azure.com")
+        assert search_client._get_openai_client("https://a.openai.azure.com") is first
+        search_client._get_openai_client("https://b.openai.azure.com")
+
+        await search_client.close_openai_clients()
+
+        assert len(created) == 2
+        for client in created:
+            client.close.assert_awaited_once()
+        assert search_client._get_openai_client("https://a.openai.azure.com") is not first
+
+
+class TestEmbeddingDimensions:
+    """``AZURE_AI_EMBEDDING_DIMENSIONS`` is forwarded and keys the cache."""
+
+    async def test_dimensions_forwarded_when_configured(self, fake_openai):
+        client, openai_client = _client_with_fake_openai(fake_openai, [1.0])
+        client._embedding_dimensions = 1024
+
+        await client.get_embeddings("Top customers")
+
+        assert openai_client.embeddings.create.call_args.kwargs["dimensions"] == 1024
+
+    async def test_dimensions_omitted_by_default(self, fake_openai):
+        client, openai_client = _client_with_fake_openai(fake_openai, [1.0])
+
+        await client.get_embeddings("Top customers")
+
+        assert "dimensions" not in openai_client.embeddings.create.call_args.kwargs
+
+    async def test_cache_is_keyed_by_dimensions(self, fake_openai):
+        client, openai_client = _client_with_fake_openai(fake_openai, [1.0])
+
+        await client.get_embeddings("Top customers")
+        client._embedding_dimensions = 1024
+        await client.get_embeddings("Top customers")
+
+        assert openai_client.embeddings.create.await_count == 2
+
+
+class TestWarmUpSearch:
+    """Startup warm-up touches each index once and never raises."""
+
+    async def test_queries_each_index_once(self, monkeypatch):
+        opened: list[str] = []
+
+        class _FakeClient:
+            def __init__(self, index_name: str) -> None:
+                opened.append(index_name)
+                self.vector_search = AsyncMock(return_value=[])
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *_exc):
+                return None
+
+        monkeypatch.setattr(search_client, "AzureSearchClient", _FakeClient)
+
+        await search_client.warm_up_search(("query_templates", "tables"))
+
+        assert opened == ["query_templates", "tables"]
+
+    async def test_failure_is_swallowed(self, monkeypatch):
+        failing = MagicMock(side_effect=ValueError("AZURE_SEARCH_ENDPOINT is required"))
+        monkeypatch.setattr(search_client, "AzureSearchClient", failing)
+
+        await search_client.warm_up_search()
@@ -0,0 +1,379 @@
+"""Tests for ``AzureSqlClient`` connection pooling and SQL token caching.
+
+``aioodbc.create_pool`` and the shared credential are replaced with mocks
+so no ODBC driver, database or Azure credentials are needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from azure.core.credentials import AccessToken
+from shared.clients import sql_client
+from shared.clients.sql_client import AzureSqlClient
+from shared.tools.sql import execute_sql_batch
+
+
+def _fake_pool() -> MagicMock:
+    pool = MagicMock()
+    connection = MagicMock()
+    connection.close = AsyncMock()
+    connection.cursor.side_effect = RuntimeError("connection reset")
+    pool.acquire = AsyncMock(return_value=connection)
+    pool.release = AsyncMock()
+    pool._wakeup = AsyncMock()
+    pool.clear = AsyncMock()
+    pool.wait_closed = AsyncMock()
+    return pool
+
+
+class _FakeConnection:
+    """Minimal connection whose queries always fail, for a real ``aioodbc.Pool``."""
+
+    def __init__(self) -> None:
+        self.closed = False
+        self.last_usage = 0.0
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def cursor(self) -> None:
+        raise RuntimeError("connection reset")
+
+
+def _cursor(description: list[tuple], rows: list[tuple]) -> MagicMock:
+    cursor = MagicMock()
+    cursor.description = description
+    cursor.execute = AsyncMock()
+    pending = list(rows)
+
+    def fetchmany(size: int) -> list[tuple]:
+        batch = pending[:size]
+        del pending[:size]
+        return batch
+
+    cursor.fetchmany = AsyncMock(side_effect=fetchmany)
+    cursor.__aenter__ = AsyncMock(return_value=cursor)
+    cursor.__aexit__ = AsyncMock(return_value=None)
+    return cursor
+
+
+@pytest.fixture
+def credential(monkeypatch) -> MagicMock:
+    fake = MagicMock()
+    fake.get_token = AsyncMock(return_value=AccessToken("token", 10_000))
+    monkeypatch.setattr(sql_client, "get_shared_credential", lambda: fake)
+    monkeypatch.setattr(sql_client.time, "time", lambda: 1_000.0)
+    sql_client._sql_token = None
+    yield fake
+    sql_client._sql_token = None
+
+
+@pytest.fixture
+def create_pool(monkeypatch, credential) -> AsyncMock:
+    sql_client._pools.clear()
+    sql_client._result_cache.clear()
+    factory = AsyncMock(side_effect=lambda **_kwargs: _fake_pool())
+    monkeypatch.setattr(sql_client.aioodbc, "create_pool", factory)
+    yield factory
+    sql_client._pools.clear()
+    sql_client._result_cache.clear()
+
+
+class TestConnectionPool:
+    """Clients share one pool per server/database."""
+
+    async def test_pool_is_reused_across_clients(self, create_pool):
+        async with AzureSqlClient(server="srv", database="db") as first:
+            pool = first._pool
+        async with AzureSqlClient(server="srv", database="db") as second:
+            assert second._pool is pool
+
+        create_pool.assert_awaited_once()
+        assert pool.release.await_count == 2
+
+    async def test_pool_runs_on_dedicated_executor(self, create_pool):
+        await sql_client.get_sql_pool("srv", "db")
+        executor = create_pool.await_args.kwargs["executor"]
+        await sql_client.get_sql_pool("srv", "other")
+        other_executor = create_pool.await_args.kwargs["executor"]
+
+        assert executor is sql_client._get_sql_executor("srv", "db")
+        assert other_executor is not executor
+        await sql_client.close_sql_pools()
+        assert sql_client._sql_executors == {}
+
+    async def test_failed_query_discards_connection(self, create_pool):
+        async with AzureSqlClient(server="srv", database="db") as client:
+            result = await client.execute_query("SELECT 1")
+            connection = client._connection
+            pool = client._pool
+
+        assert result["success"] is False
+        connection.close.assert_awaited_once()
+        pool.release.assert_awaited_once_with(connection)
+
+    async def test_discard_tolerates_pool_without_wakeup(self, create_pool):
+        pool = _fake_pool()
+        del pool._wakeup
+        create_pool.side_effect = None
+        create_pool.return_value = pool
+
+        async with AzureSqlClient(server="srv", database="db") as client:
+            result = await client.execute_query("SELECT 1")
+
+        assert result["success"] is False
+        pool.release.assert_awaited_once()
+
+    async def test_discarded_connection_wakes_blocked_acquirer(self, create_pool, monkeypatch):
+        monkeypatch.setattr(
+            sql_client.aioodbc.pool,
+            "connect",
+            AsyncMock(side_effect=lambda **_kwargs: _FakeConnection()),
+        )
+        pool = sql_client.aioodbc.Pool(dsn="", minsize=0, maxsize=1, echo=False, pool_recycle=-1)
+        create_pool.side_effect = None
+        create_pool.return_value = pool
+
+        async def _second_client() -> None:
+            async with AzureSqlClient(server="srv", database="db"):
+                pass
+
+        async with AzureSqlClient(server="srv", database="db") as holder:
+            waiter = asyncio.create_task(_second_client())
+            await asyncio.sleep(0)
+            assert not waiter.done()
+            result = await holder.execute_query("SELECT 1")
+
+        assert result["success"] is False
+        await asyncio.wait_for(waiter, timeout=1)
+        assert pool.size == 1
+
+    async def test_pool_is_replaced_before_token_expires(
+        self, create_pool, credential, monkeypatch
+    ):
+        old = await sql_client.get_sql_pool("srv", "db")
+
+        credential.get_token.return_value = AccessToken("token-2", 20_000)
+        monkeypatch.setattr(sql_client.time, "time", lambda: 10_000.0 - 60)
+        new = await sql_client.get_sql_pool("srv", "db")
+
+        assert new is not old
+        first_call, second_call = create_pool.await_args_list
+        assert second_call.kwargs["executor"] is first_call.kwargs["executor"]
+        old.close.assert_called_once()
+        old.clear.assert_awaited_once()
+
+
+class TestSqlToken:
+    """The SQL access token is reused until it nears expiry."""
+
+    async def test_token_is_cached(self, credential):
+        first = await sql_client.get_azure_sql_token()
+        second = await sql_client.get_azure_sql_token()
+
+        assert first is second
+        credential.get_token.assert_awaited_once_with(sql_client.SQL_AUTH_SCOPE)
+
+    async def test_token_is_refreshed_inside_margin(self, credential, monkeypatch):
+        await sql_client.get_azure_sql_token()
+        monkeypatch.setattr(
+            sql_client.time, "time", lambda: 10_000.0 - sql_client.TOKEN_REFRESH_MARGIN_SECONDS
+        )
+
+        await sql_client.get_azure_sql_token()
+
+        assert credential.get_token.await_count == 2
+
+
+class TestRowCap:
+    """Results are capped at ``max_rows`` without fetching the remainder."""
+
+    async def test_large_result_is_truncated(self, create_pool, monkeypatch):
+        monkeypatch.setattr(sql_client, "FETCH_BATCH_SIZE", 2)
+        rows = [(i,) for i in range(10)]
+        async with AzureSqlClient(server="srv", database="db", max_rows=3) as client:
+            cursor = _cursor([("id", int)], rows)
+            client._connection.cursor = MagicMock(return_value=cursor)
+            result = await client.execute_query("SELECT id FROM t")
+
+        assert cursor.fetchmany.await_count == 2
+        assert result["rows"] == [{"id": 0}, {"id": 1}, {"id": 2}]
+        assert result["row_count"] == 3
+        assert result["truncated"] is True
+
+    async def test_result_at_cap_is_complete(self, create_pool, monkeypatch):
+        monkeypatch.setattr(sql_client, "FETCH_BATCH_SIZE", 2)
+        rows = [(1,), (2,), (3,)]
+        async with AzureSqlClient(server="srv", database="db", max_rows=3) as client:
+            client._connection.cursor = MagicMock(return_value=_cursor([("id", int)], rows))
+            result = await client.execute_query("SELECT id FROM t")
+
+        assert result["row_count"] == 3
+        assert result["truncated"] is False
+
+
+class TestColumnarResults:
+    """Columnar clients return one value list per column."""
+
+    async def test_columns_are_converted_and_capped(self, create_pool, monkeypatch):
+        monkeypatch.setattr(sql_client, "FETCH_BATCH_SIZE", 2)
+        description = [("id", int), ("price", Decimal)]
+        rows = [(i, Decimal(i)) for i in range(5)]
+        async with AzureSqlClient(server="srv", database="db", max_rows=3, columnar=True) as client:
+            client._connection.cursor = MagicMock(return_value=_cursor(description, rows))
+            result = await client.execute_query("SELECT id, price FROM t")
+
+        assert result["columns"] == ["id", "price"]
+        assert result["data"] == [[0, 1, 2], [0.0, 1.0, 2.0]]
+        assert "rows" not in result
+        assert result["row_count"] == 3
+        assert result["truncated"] is True
+
+    async def test_exact_cap_leaves_columns_intact(self, create_pool, monkeypatch):
+        monkeypatch.setattr(sql_client, "FETCH_BATCH_SIZE", 2)
+        rows = [(1,), (2,)]
+        async with AzureSqlClient(server="srv", database="db", max_rows=2, columnar=True) as client:
+            client._connection.cursor = MagicMock(return_value=_cursor([("id", int)], rows))
+            result = await client.execute_query("SELECT id FROM t")
+
+        assert result["data"] == [[1, 2]]
+        assert result["truncated"] is False
+
+
+class TestValueConversion:
+    """Cell values are converted per column type to JSON-safe values."""
+
+    async def test_values_are_json_safe(self, create_pool):
+        description = [("qty", int), ("price", Decimal), ("day", date), ("note", None)]
+        rows = [(2, Decimal("9.50"), date(2024, 1, 31), Decimal("1.5")), (None, None, None, None)]
+        async with AzureSqlClient(server="srv", database="db") as client:
+            client._connection.cursor = MagicMock(return_value=_cursor(description, rows))
+            result = await client.execute_query("SELECT qty, price, day, note FROM t")
+
+        assert result["rows"] == [
+            {"qty": 2, "price": 9.5, "day": "2024-01-31", "note": 1.5},
+            {"qty": None, "price": None, "day": None, "note": None},
+        ]
+
+
+class TestResultCache:
+    """Identical read-only queries reuse a recent result."""
+
+    async def _run(self, query: str) -> MagicMock:
+        cursor = _cursor([("id", int)], [(1,), (2,)])
+        async with AzureSqlClient(server="srv", database="db") as client:
+            client._connection.cursor = MagicMock(return_value=cursor)
+            result = await client.execute_query(query)
+        assert result["rows"] == [{"id": 1}, {"id": 2}]
+        return cursor
+
+    async def test_repeated_query_is_served_from_cache(self, create_pool):
+        await self._run("SELECT id FROM t")
+        cursor = await self._run("SELECT id FROM t")
+
+        cursor.execute.assert_not_awaited()
+
+    async def test_time_sensitive_query_is_not_cached(self, create_pool):
+        await self._run("SELECT id FROM t WHERE day < GETDATE()")
+        cursor = await self._run("SELECT id FROM t WHERE day < GETDATE()")
+
+        cursor.execute.assert_awaited_once()
+
+    async def test_writable_client_is_not_cached(self, create_pool):
+        cursors = []
+        for _ in range(2):
+            cursor = _cursor([], [])
+            async with AzureSqlClient(server="srv", database="db", read_only=False) as client:
+                client._connection.cursor = MagicMock(return_value=cursor)
+                result = await client.execute_query("UPDATE t SET qty = qty + 1")
+            assert result["success"] is True
+            cursors.append(cursor)
+
+        for cursor in cursors:
+            cursor.execute.assert_awaited_once()
+
+    async def test_zero_ttl_disables_cache(self, create_pool, monkeypatch):
+        monkeypatch.setattr(sql_client.get_settings(), "azure_sql_result_cache_ttl_seconds", 0)
+        await self._run("SELECT id FROM t")
+        cursor = await self._run("SELECT id FROM t")
+
+        cursor.execute.assert_awaited_once()
+
+
+class TestValidateQuery:
+    """Read-only validation accepts SELECTs and rejects write keywords."""
+
+    @pytest.mark.parametrize("query", ["SELECT 1", "  select id from t", "\nSelect TOP 5 * FROM t"])
+    def test_select_is_allowed(self, query):
+        assert AzureSqlClient(server="srv").validate_query(query) == (True, None)
+
+    def test_non_select_is_rejected(self):
+        is_valid, error = AzureSqlClient(server="srv").validate_query(
+            "WITH x AS (SELECT 1) SELECT 1"
+        )
+
+        assert is_valid is False
+        assert "Only SELECT" in error
+
+    @pytest.mark.parametrize(
+        ("query", "keyword"),
+        [
+            ("SELECT 1; drop table t", "DROP"),
+            ("SELECT 1; Execute sp_who", "EXECUTE"),
+            ("SELECT * FROM t; exec sp_who", "EXEC"),
+        ],
+    )
+    def test_forbidden_keyword_is_rejected(self, query, keyword):
+        is_valid, error = AzureSqlClient(server="srv").validate_query(query)
+
+        assert is_valid is False
+        assert f"forbidden keyword: {keyword}." in error
+
+    def test_writes_allowed_when_not_read_only(self):
+        client = AzureSqlClient(server="srv", read_only=False)
+
+        assert client.validate_query("DELETE FROM t") == (True, None)
+
+
+class TestExecuteSqlBatch:
+    """A failed batch query doesn't leave the rest on a discarded connection."""
+
+    async def test_queries_after_a_failure_use_a_fresh_connection(self, create_pool, monkeypatch):
+        monkeypatch.setenv("AZURE_SQL_SERVER", "srv")
+        # Importing the real ``api`` package pulls in the app and its auth middleware.
+        step_events = types.SimpleNamespace(emit_step_start=MagicMock(), emit_step_end=MagicMock())
+        monkeypatch.setitem(sys.modules, "api.step_events", step_events)
+        first = MagicMock()
+        first.close = AsyncMock()
+        first.cursor.side_effect = [
+            _cursor([("id", int)], [(1,)]),
+            RuntimeError("connection reset"),
+        ]
+        second = MagicMock()
+        second.close = AsyncMock()
+        second.cursor.return_value = _cursor([("id", int)], [(3,)])
+        pool = _fake_pool()
+        pool.acquire.side_effect = [first, second]
+        create_pool.side_effect = None
+        create_pool.return_value = pool
+
+        results = await execute_sql_batch.func([
+            "SELECT id FROM a",
+            "SELECT id FROM b",
+            "SELECT id FROM c",
+        ])
+
+        assert [r["success"] for r in results] == [True, False, True]
+        assert results[2]["rows"] == [{"id": 3}]
+        first.close.assert_awaited_once()
+        second.close.assert_not_awaited()
+        assert pool.release.await_args_list[0].args == (first,)
+        assert pool.release.await_args_list[1].args == (second,)
+        step_events.emit_step_end.assert_called_once()
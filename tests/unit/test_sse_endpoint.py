@@ -7,12 +7,15 @@ directly with mocked dependencies.  No HTTP client, no Azure credentials.
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import json
 import sys
 import types
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
 # Prevent ``api.__init__`` from importing ``api.main`` (which pulls in auth
 # middleware and triggers a pydantic deprecation error).  We only need the
 # thin modules ``api.session_manager``, ``api.step_events``, etc.
@@ -118,7 +121,7 @@ _ORCH_PATCHES = {
     "load_prompt": "assistant.load_assistant_prompt",
     "Agent": "agent_framework.Agent",
     "AzureAIClient": "agent_framework_azure_ai.AzureAIClient",
-    "DefaultCred": "azure.identity.aio.DefaultAzureCredential",
+    "shared_credential": "shared.clients.credential.get_shared_credential",
 }
 
 
@@ -260,6 +263,24 @@ class TestConversationStream:
         # process_query should NOT have been called
         mock_process_query.assert_not_called()
 
+    @pytest.mark.parametrize(
+        ("text", "conversation_id"),
+        [('Say "hi"\n\tcafé 😀', None), ("", ""), ("Hello", "test-thread-123")],
+    )
+    def test_fixed_shape_frames_match_generic_encoding(
+        self, text: str, conversation_id: str | None
+    ) -> None:
+        from api.routers.chat import _done_event, _sse, _text_event
+
+        assert _text_event(text, conversation_id) == _sse({
+            "text": text,
+            "conversation_id": conversation_id,
+        })
+        assert _done_event(conversation_id) == _sse({
+            "done": True,
+            "conversation_id": conversation_id,
+        })
+
 
 # ── Clarification Result ────────────────────────────────────────────────
 
@@ -517,7 +538,7 @@ class TestErrorHandling:
 
 
 class TestStepEventDrain:
-    """Verify queued step events are emitted before the main response."""
+    """Verify pipeline step events are emitted before the main response."""
 
     @patch(_ORCH_PATCHES["process_query"], new_callable=AsyncMock)
     @patch(_ORCH_PATCHES["create_clients"])
@@ -582,6 +603,78 @@ class TestStepEventDrain:
         )
         assert search_idx < tool_idx
 
+    @patch(_ORCH_PATCHES["process_query"], new_callable=AsyncMock)
+    @patch(_ORCH_PATCHES["create_clients"])
+    @patch(_ORCH_PATCHES["get_settings"])
+    @patch(_ORCH_PATCHES["get_assistant"])
+    @patch(_ORCH_PATCHES["store_assistant"])
+    async def test_step_events_stream_while_pipeline_runs(
+        self,
+        mock_store,
+        mock_get_assistant,
+        mock_get_settings,
+        mock_create_clients,
+        mock_process_query,
+    ) -> None:
+
+        from api.routers.chat import generate_orchestrator_streaming_response
+
+        mock_get_settings.return_value = _mock_settings()
+        mock_get_assistant.return_value = _mock_assistant()
+        mock_create_clients.return_value = MagicMock()
+
+        step_seen = asyncio.Event()
+
+        async def _process_waiting_for_client(request, clients):
+            """Only finish once the client has received the first step."""
+            from api.step_events import get_step_queue
+
+            get_step_queue().put_nowait({"step": "Searching templates...", "status": "started"})
+            await asyncio.wait_for(step_seen.wait(), timeout=5)
+            return _success_response()
+
+        mock_process_query.side_effect = _process_waiting_for_client
+
+        chunks = []
+        async for chunk in generate_orchestrator_streaming_response(
+            message="Show orders",
+            conversation_id="test-thread-123",
+        ):
+            chunks.append(chunk)
+            if "Searching templates..." in chunk:
+                step_seen.set()
+
+        events = _parse_sse_events(chunks)
+        assert any("tool_call" in e for e in events)
+        assert events[-1]["done"] is True
+
+    async def test_end_sentinel_evicts_oldest_step_when_queue_full(self) -> None:
+        from api.routers.chat import _STEPS_DONE, _end_step_stream
+
+        queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=2)
+        queue.put_nowait({"step": "first", "status": "started"})
+        queue.put_nowait({"step": "second", "status": "started"})
+
+        _end_step_stream(queue)
+
+        assert queue.get_nowait()["step"] == "second"
+        assert queue.get_nowait() is _STEPS_DONE
+
+    async def test_queued_step_events_coalesce_into_one_chunk(self) -> None:
+        from api.routers.chat import _stream_step_events
+
+        queue: asyncio.Queue[dict] = asyncio.Queue()
+        queue.put_nowait({"step": "first", "status": "started"})
+        queue.put_nowait({"step": "first", "status": "completed", "duration_ms": 5})
+
+        async def _work() -> None:
+            return None
+
+        chunks = [chunk async for chunk in _stream_step_events(asyncio.create_task(_work()), queue)]
+
+        assert len(chunks) == 1
+        assert [e["step"] for e in _parse_sse_events(chunks)] == ["first", "first"]
+
 
 # ── Session Cache Integration ───────────────────────────────────────────
 
@@ -589,7 +682,7 @@ class TestStepEventDrain:
 class TestSessionCacheIntegration:
     """Verify DataAssistant creation and reuse via session cache."""
 
-    @patch(_ORCH_PATCHES["DefaultCred"])
+    @patch(_ORCH_PATCHES["shared_credential"])
     @patch(_ORCH_PATCHES["AzureAIClient"])
     @patch(_ORCH_PATCHES["Agent"])
     @patch(_ORCH_PATCHES["load_prompt"], return_value="test prompt")
@@ -610,7 +703,7 @@ class TestSessionCacheIntegration:
         mock_load_prompt,
         mock_chat_agent_cls,
         mock_ai_client_cls,
-        mock_default_cred_cls,
+        mock_get_credential,
     ) -> None:
         from api.routers.chat import generate_orchestrator_streaming_response
 
@@ -666,7 +759,7 @@ class TestSessionCacheIntegration:
         assert events[-1]["done"] is True
         assistant.classify_intent.assert_called_once_with("Show orders")
 
-    @patch(_ORCH_PATCHES["DefaultCred"])
+    @patch(_ORCH_PATCHES["shared_credential"])
     @patch(_ORCH_PATCHES["AzureAIClient"])
     @patch(_ORCH_PATCHES["Agent"])
     @patch(_ORCH_PATCHES["load_prompt"], return_value="test prompt")
@@ -676,7 +769,7 @@ class TestSessionCacheIntegration:
     @patch(_ORCH_PATCHES["get_settings"])
     @patch(_ORCH_PATCHES["get_assistant"])
     @patch(_ORCH_PATCHES["store_assistant"])
-    async def test_uses_managed_identity_when_client_id_set(  # noqa: PLR0913, PLR0917
+    async def test_uses_shared_credential(  # noqa: PLR0913, PLR0917
         self,
         mock_store,
         mock_get_assistant,
@@ -687,13 +780,11 @@ class TestSessionCacheIntegration:
         mock_load_prompt,
         mock_chat_agent_cls,
         mock_ai_client_cls,
-        mock_default_cred_cls,
+        mock_get_credential,
     ) -> None:
         from api.routers.chat import generate_orchestrator_streaming_response
 
-        settings = _mock_settings()
-        settings.azure_client_id = "my-client-id"
-        mock_get_settings.return_value = settings
+        mock_get_settings.return_value = _mock_settings()
         mock_get_assistant.return_value = None
 
         new_assistant = _mock_assistant()
@@ -708,6 +799,5 @@ class TestSessionCacheIntegration:
             ),
         )
 
-        mock_default_cred_cls.assert_called_once_with(
-            managed_identity_client_id="my-client-id",
-        )
+        mock_get_credential.assert_called_once_with()
+        assert mock_ai_client_cls.call_args.kwargs["credential"] is mock_get_credential.return_value
@@ -0,0 +1,49 @@
+"""Tests for ``TemplateDraftCache`` keying, TTL and LRU eviction."""
+
+from __future__ import annotations
+
+from models import SQLDraft
+from shared import template_draft_cache
+from shared.template_draft_cache import TemplateDraftCache
+
+
+def _draft(sql: str = "SELECT 1") -> SQLDraft:
+    return SQLDraft(status="success", source="template", completed_sql=sql)
+
+
+class TestTemplateDraftCache:
+    """Validated drafts are reused for repeats of the same question."""
+
+    def test_hit_ignores_case_and_whitespace(self):
+        cache = TemplateDraftCache()
+        draft = _draft()
+        cache.put("tpl-1", "Show orders from  Seattle", draft)
+
+        assert cache.get("tpl-1", "show orders from seattle ") is draft
+
+    def test_miss_for_other_template_or_question(self):
+        cache = TemplateDraftCache()
+        cache.put("tpl-1", "Show orders from Seattle", _draft())
+
+        assert cache.get("tpl-2", "Show orders from Seattle") is None
+        assert cache.get("tpl-1", "Show orders from Tacoma") is None
+
+    def test_expired_entry_is_dropped(self, monkeypatch):
+        cache = TemplateDraftCache(ttl_seconds=10)
+        now = 1000.0
+        monkeypatch.setattr(template_draft_cache.time, "monotonic", lambda: now)
+        cache.put("tpl-1", "q", _draft())
+
+        now += 10
+        assert cache.get("tpl-1", "q") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = TemplateDraftCache(max_entries=2)
+        cache.put("tpl-1", "first", _draft())
+        cache.put("tpl-1", "second", _draft())
+        cache.get("tpl-1", "first")
+        cache.put("tpl-1", "third", _draft())
+
+        assert cache.get("tpl-1", "first") is not None
+        assert cache.get("tpl-1", "second") is None
+        assert cache.get("tpl-1", "third") is not None
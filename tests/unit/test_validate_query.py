@@ -166,8 +166,12 @@ class TestStatementTypeChecks:
                 "DROP",
                 "DROP TABLE Sales.Customers",
             ),
+            (
+                "ALTER",
+                "\n  alter table Sales.Customers add Note nvarchar(10)",
+            ),
         ],
-        ids=["insert", "update", "delete", "drop"],
+        ids=["insert", "update", "delete", "drop", "indented_lowercase_alter"],
     )
     def test_non_select_statement(self, keyword: str, sql: str) -> None:
         """Non-SELECT statement types are rejected."""
@@ -0,0 +1,114 @@
+"""Tests for the ``workflow.clients`` search adapters and agent version pinning.
+
+``AzureSearchClient`` and ``AzureAIClient`` are replaced with fakes, so no
+Azure AI Search, Foundry endpoint or credentials are needed.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from workflow import clients
+from workflow.clients import (
+    TableSearchAdapter,
+    TemplateSearchAdapter,
+    create_pipeline_clients,
+    remember_agent_versions,
+)
+
+
+@pytest.fixture
+def search_client(monkeypatch) -> MagicMock:
+    client = MagicMock()
+    client.vector_search = AsyncMock(return_value=[])
+    client.hybrid_search = AsyncMock(return_value=[])
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=client)
+    factory.return_value.__aexit__ = AsyncMock(return_value=None)
+    monkeypatch.setattr(clients, "AzureSearchClient", factory)
+    return factory
+
+
+class _FakeAIClient:
+    """Stands in for ``AzureAIClient``; a Foundry lookup would set ``agent_version``."""
+
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+        self.agent_version: str | None = None
+        self.conversation_id: str | None = None
+
+
+@pytest.fixture
+def fake_ai_client(monkeypatch) -> None:
+    monkeypatch.setattr(clients, "AzureAIClient", _FakeAIClient)
+    monkeypatch.setattr(clients, "get_shared_credential", MagicMock)
+    monkeypatch.setattr(clients, "_agent_versions", {})
+    monkeypatch.setattr(clients, "_allowed_values_providers", {})
+
+
+class TestShortQuestions:
+    """Questions too short to embed skip the search round-trip."""
+
+    @pytest.mark.parametrize("question", ["", "ok", "  a  "])
+    async def test_template_search_skips_short_question(self, search_client, question):
+        result = await TemplateSearchAdapter(0.8, 0.05).search(question)
+
+        assert result["has_high_confidence_match"] is False
+        assert result["all_matches"] == []
+        assert result["message"] == "Question too short to search"
+        search_client.assert_not_called()
+
+    @pytest.mark.parametrize("question", ["", "ok", "  a  "])
+    async def test_table_search_skips_short_question(self, search_client, question):
+        result = await TableSearchAdapter(0.5).search(question)
+
+        assert result["has_matches"] is False
+        assert result["tables"] == []
+        assert result["message"] == "Question too short to search"
+        search_client.assert_not_called()
+
+    async def test_template_search_runs_at_minimum_length(self, search_client):
+        result = await TemplateSearchAdapter(0.8, 0.05).search("top")
+
+        assert result["message"] == "No query templates found"
+        client = search_client.return_value.__aenter__.return_value
+        client.vector_search.assert_awaited_once()
+
+    async def test_table_search_runs_at_minimum_length(self, search_client):
+        result = await TableSearchAdapter(0.5).search("top")
+
+        assert result["message"] == "No tables found matching the query"
+        client = search_client.return_value.__aenter__.return_value
+        client.hybrid_search.assert_awaited_once()
+
+
+class TestAgentVersionPinning:
+    """Resolved Foundry agent versions are pinned on the next clients."""
+
+    def test_unpinned_agents_are_built_without_a_version(self, fake_ai_client, test_settings):
+        pipeline = create_pipeline_clients(test_settings)
+
+        assert pipeline.param_extractor_agent.client.agent_version is None
+        assert pipeline.query_builder_agent.client.agent_version is None
+
+    def test_remembered_version_is_pinned_on_next_client(self, fake_ai_client, test_settings):
+        first = create_pipeline_clients(test_settings)
+        first.param_extractor_agent.client.agent_version = "7"
+        remember_agent_versions(first, test_settings)
+
+        second = create_pipeline_clients(test_settings)
+
+        assert second.param_extractor_agent.client.agent_version == "7"
+        assert second.query_builder_agent.client.agent_version is None
+
+    def test_expired_version_is_not_pinned(self, fake_ai_client, test_settings, monkeypatch):
+        first = create_pipeline_clients(test_settings)
+        first.param_extractor_agent.client.agent_version = "7"
+        remember_agent_versions(first, test_settings)
+        expired = clients.time.monotonic() + clients.AGENT_VERSION_TTL_SECONDS
+        monkeypatch.setattr(clients.time, "monotonic", lambda: expired)
+
+        second = create_pipeline_clients(test_settings)
+
+        assert second.param_extractor_agent.client.agent_version is None